@@ -4,12 +4,12 @@ GUI components for battle states.
 """
 import sys
 import pygame as pg
-from . import setup, observer
+from . import setup, observer, tools
 from . import constants as c
-import googletrans#구글 번역 API
+from . import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 #Python 2/3 compatibility.
 if sys.version_info[0] == 2:
@@ -25,9 +25,8 @@ class InfoBox(object):
         self.enemy_damage = 0                               # 적의 피해 0 초기화
         self.player_damage = 0                              # 플레이어 피해 0        
         self.state = c.SELECT_ACTION
-        self.title_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)    # 제목 글씨체 폰트 설정
-        self.title_font.set_underline(True)                             # 제목 글씨 밑줄 추가
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 18)          # 기본 글씨체는 제목 글씨체와 동일, 크기만 작음
+        self.title_font = setup.get_font(c.MAIN_FONT, 22, underline=True)  # 제목 글씨체 폰트 설정(밑줄 추가)
+        self.font = setup.get_font(c.MAIN_FONT, 18)                        # 기본 글씨체는 제목 글씨체와 동일, 크기만 작음
         self.experience_points = experience                             # 받아온 경험치 저장
         self.gold_earned = gold                                         # 받아온 골드 저장
         self.state_dict = self.make_state_dict()                        # 상태창(사전) 만드는 함수 호출
@@ -67,7 +66,7 @@ class InfoBox(object):
         Return text of enemy being hit using calculated damage.
         계산된 데미지를 사용하여 적에게 명중하는 텍스트를 반환
         """
-        return translator.translate("Enemy hit with {} damage.".format(self.enemy_damage), dest='ko').text
+        return translator.format("Enemy hit with {} damage.", self.enemy_damage, dest='ko')
 
     def make_item_text(self):
         """
@@ -81,7 +80,7 @@ class InfoBox(object):
 
         for item in allowed_item_list:
             if item in inventory:
-                text = translator.translate(item + ": " + str(inventory[item]['quantity']), dest='ko').text
+                text = "{}: {}".format(item, inventory[item]['quantity'])
                 item_text_list.append(text)
 
         item_text_list.append(translator.translate('BACK', dest='ko').text)
@@ -118,12 +117,14 @@ class InfoBox(object):
             if i == 0:  # index가 0일때(첫번째 배열일 때)
                 x = 195
                 y = 10
-                surface = self.title_font.render(text, True, c.NEAR_BLACK)
+                surface = tools.render_text(self.title_font, text,
+                                                 True, c.NEAR_BLACK)
                 rect = surface.get_rect(x=x, y=y)
             else:       # 첫번째가 아닐 때
                 x = 100
                 y = (i * 30) + 20
-                surface = self.font.render(text, True, c.NEAR_BLACK)
+                surface = tools.render_text(self.font, text,
+                                           True, c.NEAR_BLACK)
                 rect = surface.get_rect(x=x, y=y)
             sprite.image = surface
             sprite.rect = rect
@@ -149,7 +150,8 @@ class InfoBox(object):
             text_sprites = self.make_text_sprites(self.make_magic_text())
             text_sprites.draw(surface)
         else:                               # 
-            text_surface = self.font.render(self.state_dict[self.state], True, c.NEAR_BLACK)
+            text_surface = tools.render_text(self.font, self.state_dict[self.state],
+                                             True, c.NEAR_BLACK)
             text_rect = text_surface.get_rect(x=50, y=50)
             surface.blit(text_surface, text_rect)
 
@@ -174,7 +176,7 @@ class InfoBox(object):
     # 플레이어가 공격을 받았을 때
     def player_hit(self):
         if self.player_damage:  # 공격 성공시
-            return translator.translate("Player hit with {} damage".format(self.player_damage), dest='ko').text
+            return translator.format("Player hit with {} damage", self.player_damage, dest='ko')
         else:                   # 공격 실패시
             return translator.translate("Enemy missed!", dest='ko').text
 
@@ -190,21 +192,21 @@ class InfoBox(object):
         Show how much experience the player earned.
         플레이어가 배틀에서 얻은 경험치 반환
         """
-        return translator.translate("You earned {} experience points this battle!".format(self.experience_points), dest='ko').text
+        return translator.format("You earned {} experience points this battle!", self.experience_points, dest='ko')
 
     def show_gold(self):
         """
         Show how much gold the player earned.
         플레이어가 배틀에서 얻은 골드 반환
         """
-        return translator.translate("You found {} gold.".format(self.gold_earned), dest='ko').text
+        return translator.format("You found {} gold.", self.gold_earned, dest='ko')
 
     def level_up(self):
         """
         Return message indicating a level up for player.
         플레이어의 레벨없을 나타내는 메시지 반환
         """
-        return translator.translate("You leveled up to Level {}!".format(self.game_data['player stats']['Level']), dest='ko').text
+        return translator.format("You leveled up to Level {}!", self.game_data['player stats']['Level'], dest='ko')
 
     # 레벨 업 메시지 상태창에 저장
     def reset_level_up_message(self):
@@ -218,7 +220,7 @@ class SelectBox(object):
     공격할지, 아이템을 사용할지, 마법을 사용할지, 도망칠지 선택하는 상자
     """
     def __init__(self):
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
         self.slots = self.make_slots()
         self.image = self.make_image()
         self.rect = self.image.get_rect(bottom=608,
@@ -236,7 +238,7 @@ class SelectBox(object):
         surface.blit(image, (0, 0))
 
         for text in self.slots: #slot들 안에 있는 text들 반복문 (공격, 아이템, 마법, 도망)
-            text_surface = self.font.render(text, True, c.NEAR_BLACK)
+            text_surface = tools.render_text(self.font, text, True, c.NEAR_BLACK)
             text_rect = text_surface.get_rect(x=self.slots[text]['x'],
                                               y=self.slots[text]['y'])
             surface.blit(text_surface, text_rect)   
@@ -477,12 +479,42 @@ class PlayerHealth(object):
     def __init__(self, select_box_rect, game_data):
         self.health_stats = game_data['player stats']['health']
         self.magic_stats = game_data['player stats']['magic']
-        self.title_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.title_font = setup.get_font(c.MAIN_FONT, 22)
         self.posx = select_box_rect.centerx
         self.posy = select_box_rect.y - 5
+        self.shown_stats = None
+        self._image = None
+        self._rect = None
+
+    def get_shown_stats(self):
+        """
+        Return the values the panel displays.
+        패널에 표시되는 값들을 반환한다.
+        """
+        return (self.health_stats['current'], self.health_stats['maximum'],
+                self.magic_stats['current'], self.magic_stats['maximum'])
+
+    def check_for_rebuild(self):
+        """
+        Rebuild the cached image and rect only if the displayed stats changed.
+        표시되는 값이 바뀌었을 때만 저장된 이미지와 rect를 다시 만든다.
+        """
+        shown_stats = self.get_shown_stats()
+        if shown_stats != self.shown_stats:
+            self.shown_stats = shown_stats
+            self._image = self.make_image()
+            self._rect = self._image.get_rect(centerx=self.posx, bottom=self.posy)
 
     @property
     def image(self):
+        """
+        Cached image surface for the player.
+        저장된 플레이어의 이미지 표면
+        """
+        self.check_for_rebuild()
+        return self._image
+
+    def make_image(self):
         """
         Make the image surface for the player
         플레이어의 이미지 표면 만들기
@@ -496,7 +528,7 @@ class PlayerHealth(object):
         else:
             buffer = ''
         health_string = "Health: {}{}/{}".format(buffer, current_health, max_health)
-        health_surface =  self.title_font.render(health_string, True, c.NEAR_BLACK)
+        health_surface =  tools.render_text(self.title_font, health_string, True, c.NEAR_BLACK)
         health_rect = health_surface.get_rect(x=20, y=9)
 
         current_magic = str(self.magic_stats['current'])
@@ -508,7 +540,7 @@ class PlayerHealth(object):
             buffer = ''
         max_magic = str(self.magic_stats['maximum'])
         magic_string = "Magic:  {}{}/{}".format(buffer, current_magic, max_magic)
-        magic_surface = self.title_font.render(magic_string, True, c.NEAR_BLACK)
+        magic_surface = tools.render_text(self.title_font, magic_string, True, c.NEAR_BLACK)
         magic_rect = magic_surface.get_rect(x=20, top=health_rect.bottom)
 
         box_surface = setup.GFX['battlestatbox']
@@ -524,14 +556,16 @@ class PlayerHealth(object):
     @property
     def rect(self):
         """
-        Make the rect object for image surface.
-        이미지에 적합한 둥금 정도를 가진 객체 만들기
+        Cached rect object for image surface.
+        이미지에 적합한 둥금 정도를 가진 저장된 객체
         """
-        return self.image.get_rect(centerx=self.posx, bottom=self.posy)
+        self.check_for_rebuild()
+        return self._rect
 
     def draw(self, surface):
         """
         Draw health to surface.
         체력을 화면에 그리기
         """
-        surface.blit(self.image, self.rect)
+        self.check_for_rebuild()
+        surface.blit(self._image, self._rect)
@@ -1,7 +1,219 @@
-import random
+import collections, random
 import pygame as pg
 from . import constants as c
 
+#NumPy가 설치되어 있으면 정적 충돌 맵을 불리언 배열로, 없으면 막힌 타일의 집합으로 만든다.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SpriteGroup(pg.sprite.Group):
+    """
+    Sprite group that counts its membership changes in version, so the
+    collision handler can tell when a sprite was added or removed.
+    스프라이트가 추가되거나 빠질 때마다 version을 올리는 스프라이트 그룹
+    """
+    def __init__(self, *sprites):
+        self.version = 0
+        super(SpriteGroup, self).__init__(*sprites)
+
+    def add_internal(self, sprite, *args):
+        super(SpriteGroup, self).add_internal(sprite, *args)
+        self.version += 1
+
+    def remove_internal(self, sprite):
+        super(SpriteGroup, self).remove_internal(sprite)
+        self.version += 1
+
+
+class SpatialGrid(object):
+    """
+    Uniform grid of cell_size pixel cells holding the sprite blockers.
+    Every cell holds the (rect, owner, cells) entries whose rect overlaps
+    it, so a query only looks at the entries near the rect it is given.
+    32px 타일 단위로 스프라이트의 차단 타일을 담는 격자. 각 칸에는 그 칸과 겹치는 사각형들이 들어 있어서 주변 칸만 검사하면 된다.
+    """
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = collections.defaultdict(list)
+
+    def cells_for(self, rect):
+        """
+        Yield the (column, row) of every cell rect overlaps.
+        rect가 겹치는 모든 칸의 (열, 행)을 반환
+        """
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+
+    def insert(self, rect, owner=None):
+        """
+        Add rect to the cells it overlaps and return its entry.  The
+        entry remembers those cells, so the rect may be moved afterwards.
+        rect를 겹치는 칸들에 추가하고 항목을 반환. 항목이 칸들을 기억하므로 rect는 나중에 옮겨도 된다.
+        """
+        cells = tuple(self.cells_for(rect))
+        entry = (rect, owner, cells)
+        for cell in cells:
+            self.cells[cell].append(entry)
+        return entry
+
+    def remove(self, entry):
+        """
+        Remove an entry from the cells it was inserted into.
+        항목을 추가했던 칸들에서 제거
+        """
+        for cell in entry[2]:
+            bucket = self.cells.get(cell)
+            if bucket:
+                for i, other in enumerate(bucket):
+                    if other is entry:
+                        del bucket[i]
+                        break
+                if not bucket:
+                    del self.cells[cell]
+
+    def collides(self, rect):
+        """
+        Check whether rect collides with any entry in the cells it
+        overlaps.  Runs every frame, so the cells are walked inline.
+        rect가 겹치는 칸들의 항목 중 하나라도 rect와 충돌하는지 확인
+        """
+        cells = self.cells
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = cells.get((column, row))
+                if bucket:
+                    for entry in bucket:
+                        if rect.colliderect(entry[0]):
+                            return True
+        return False
+
+
+class TileGrid(object):
+    """
+    Static collision map with one cell per tile, compiled once per level
+    from the TMX blockers.  Uses a NumPy boolean array when NumPy is
+    installed and a set of blocked tiles otherwise.
+    TMX 차단벽을 타일 하나당 한 칸인 충돌 맵으로 한 번만 만들어 두고, 칸을 바로 찾아 검사한다.
+    """
+    def __init__(self, blockers, columns, rows, tile_size=32):
+        self.columns = columns
+        self.rows = rows
+        self.tile_size = tile_size
+        #맵 밖으로 걸친 차단벽(맨 윗줄의 y - 32 등)은 따로 보관한다.
+        self.outside = set()
+        self.numpy = np is not None
+        if self.numpy:
+            self.blocked = np.zeros((rows, columns), dtype=bool)
+        else:
+            self.blocked = set()
+        for blocker in blockers:
+            for column, row in self.tiles_for(blocker):
+                self.block(column, row)
+
+    def tiles_for(self, rect):
+        """
+        Yield the (column, row) of every tile rect overlaps.
+        rect가 겹치는 모든 타일의 (열, 행)을 반환
+        """
+        size = self.tile_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+
+    def inside(self, column, row):
+        return 0 <= column < self.columns and 0 <= row < self.rows
+
+    def block(self, column, row):
+        if not self.inside(column, row):
+            self.outside.add((column, row))
+        elif self.numpy:
+            self.blocked[row, column] = True
+        else:
+            self.blocked.add((column, row))
+
+    def is_blocked(self, column, row):
+        """
+        Check a single tile.
+        타일 하나가 막혀 있는지 확인
+        """
+        if not self.inside(column, row):
+            return (column, row) in self.outside
+        if self.numpy:
+            return bool(self.blocked[row, column])
+        return (column, row) in self.blocked
+
+    def collides(self, rect):
+        """
+        Check whether rect overlaps a blocked tile.  A rect the size of a
+        tile overlaps at most four.
+        rect가 막힌 타일과 겹치는지 확인. 타일 크기의 rect는 많아야 네 칸만 본다.
+        """
+        size = self.tile_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                if self.is_blocked(column, row):
+                    return True
+        return False
+
+    def free_tiles(self):
+        """
+        Return the (column, row) of every open tile on the map.
+        맵에서 막히지 않은 모든 타일의 (열, 행)을 반환
+        """
+        if self.numpy:
+            rows, columns = np.nonzero(~self.blocked)
+            return list(zip(columns.tolist(), rows.tolist()))
+        return [(column, row) for row in range(self.rows)
+                for column in range(self.columns)
+                if (column, row) not in self.blocked]
+
+    def reachable(self, start):
+        """
+        Return the set of (column, row) tiles that can be walked to from
+        start with up/down/left/right steps.
+        start 타일에서 상하좌우로 걸어서 갈 수 있는 타일들의 집합을 반환
+        """
+        column, row = start
+        if not self.inside(column, row) or self.is_blocked(column, row):
+            return set()
+
+        if self.numpy:
+            #막히지 않은 칸 안에서 도달 영역을 한 칸씩 통째로 넓혀 간다.
+            free = ~self.blocked
+            reached = np.zeros_like(free)
+            reached[row, column] = True
+            while True:
+                grown = reached.copy()
+                grown[1:, :] |= reached[:-1, :]
+                grown[:-1, :] |= reached[1:, :]
+                grown[:, 1:] |= reached[:, :-1]
+                grown[:, :-1] |= reached[:, 1:]
+                grown &= free
+                if np.array_equal(grown, reached):
+                    break
+                reached = grown
+            rows, columns = np.nonzero(reached)
+            return set(zip(columns.tolist(), rows.tolist()))
+
+        reached = set([start])
+        frontier = collections.deque([start])
+        while frontier:
+            column, row = frontier.popleft()
+            for tile in ((column + 1, row), (column - 1, row),
+                         (column, row + 1), (column, row - 1)):
+                if (tile not in reached and self.inside(*tile)
+                        and not self.is_blocked(*tile)):
+                    reached.add(tile)
+                    frontier.append(tile)
+        return reached
+
+
 class CollisionHandler(object):
     """
     Handles collisions between the user, blockers and computer characters
@@ -10,37 +222,69 @@ class CollisionHandler(object):
     def __init__(self, player, blockers, sprites, portals, level):
         self.player = player
         self.static_blockers = blockers
-        self.blockers = self.make_blocker_list(blockers, sprites)
         self.sprites = sprites
         self.portals = portals
         self.level = level
+        tmx_data = level.renderer.tmx_data
+        self.tile_grid = TileGrid(blockers, tmx_data.width, tmx_data.height)
+        self.grid = SpatialGrid()
+        self.sprite_list = []
+        self.sprites_version = None
+        self.sweep_list = []
+        self.sprite_hits = set()
+        self.sprite_entries = {}
+        self.sprite_versions = {}
+        self.collided = []
+        self.update_sprite_blockers()
 
-    def make_blocker_list(self, blockers, sprites):
+    def refresh_sprite_list(self):
         """
-        Return a combined list of sprite blockers and object blockers.
-        스프라이트 차단기 및 객체 차단기의 결합된 목록을 반환
+        Copy the sprite group into sprite_list and drop the grid entries
+        and blocker versions of sprites that have left it.
+        스프라이트 그룹을 sprite_list로 복사하고, 그룹을 떠난 스프라이트의 항목과 버전을 지운다.
         """
-        blocker_list = []
-
-        for blocker in blockers:
-            blocker_list.append(blocker)
+        self.sprites_version = self.sprites.version
+        self.sprite_list[:] = self.sprites.sprites()
+        self.sweep_list[:] = self.sprite_list
+        for sprite in list(self.sprite_entries):
+            if not self.sprites.has(sprite):
+                for entry in self.sprite_entries.pop(sprite):
+                    self.grid.remove(entry)
+                self.sprite_versions.pop(sprite, None)
 
-        for sprite in sprites:
-            blocker_list.extend(sprite.blockers)
+    def update_sprite_blockers(self):
+        """
+        Re-index the blockers of sprites whose blocker_version changed
+        since the last frame.  Sprites that kept their tiles cost one
+        comparison.
+        차단 타일이 바뀐(blocker_version이 달라진) 스프라이트만 격자에 다시 넣는다.
+        """
+        if self.sprites_version != self.sprites.version:
+            self.refresh_sprite_list()
 
-        return blocker_list
+        grid = self.grid
+        versions = self.sprite_versions
+        for sprite in self.sprite_list:
+            if versions.get(sprite) != sprite.blocker_version:
+                entries = self.sprite_entries.get(sprite)
+                if entries is None:
+                    entries = self.sprite_entries[sprite] = []
+                for entry in entries:
+                    grid.remove(entry)
+                entries[:] = [grid.insert(blocker, sprite)
+                              for blocker in sprite.blockers]
+                versions[sprite] = sprite.blocker_version
 
     def update(self, keys, current_time):
         """
         Check for collisions between game objects.
         게임 개체 간의 충돌을 확인합니다.
         """
-        self.blockers = self.make_blocker_list(self.static_blockers,
-                                               self.sprites)
+        self.update_sprite_blockers()
         self.player.rect.move_ip(self.player.x_vel, self.player.y_vel)
         self.check_for_blockers()
 
-        for sprite in self.sprites:
+        for sprite in self.sprite_list:
             sprite.rect.move_ip(sprite.x_vel, sprite.y_vel)
         self.check_for_blockers()
 
@@ -50,7 +294,7 @@ class CollisionHandler(object):
                 self.check_for_battle()
             self.player.begin_resting()
 
-        for sprite in self.sprites:
+        for sprite in self.sprite_list:
             if sprite.state == 'automoving':
                 if sprite.rect.x % 32 == 0 and sprite.rect.y % 32 == 0:
                     sprite.begin_auto_resting()
@@ -72,34 +316,63 @@ class CollisionHandler(object):
         차단기 수정과의 충돌을 확인합니다.
         """
         player_collided = False
-        sprite_collided_list = []
+        collided = self.collided
 
-        for blocker in self.blockers:
-            if self.player.rect.colliderect(blocker):
-                player_collided = True
+        #플레이어는 맵의 차단벽과 스프라이트의 차단 타일에 막힌다(주변 칸만 검사).
+        if (self.tile_grid.collides(self.player.rect) or
+                self.grid.collides(self.player.rect)):
+            player_collided = True
 
         if player_collided: 
             self.reset_after_collision(self.player)
             self.player.begin_resting()
 
-        for sprite in self.sprites:
-            for blocker in self.static_blockers:
-                if sprite.rect.colliderect(blocker):
-                    sprite_collided_list.append(sprite)
-            if sprite.rect.colliderect(self.player.rect):
-                sprite_collided_list.append(sprite)
-            sprite.kill()
-            if pg.sprite.spritecollideany(sprite, self.sprites):
-                sprite_collided_list.append(sprite)
-            self.sprites.add(sprite)
-            for blocker in sprite.wander_box:
-                if sprite.rect.colliderect(blocker):
-                    sprite_collided_list.append(sprite)
-
-
-        for sprite in sprite_collided_list:
+        sprite_hits = self.find_sprite_overlaps()
+        for sprite in self.sprite_list:
+            #스프라이트는 자기 이동 반경을 벗어나거나 다른 스프라이트, 플레이어, 맵의 차단벽에 닿으면 막힌다.
+            if (not sprite.wander_box.contains(sprite.rect) or
+                    sprite in sprite_hits or
+                    sprite.rect.colliderect(self.player.rect) or
+                    self.tile_grid.collides(sprite.rect)):
+                collided.append(sprite)
+
+        for sprite in collided:
             self.reset_after_collision(sprite)
             sprite.begin_auto_resting()
+        del collided[:]
+
+    def find_sprite_overlaps(self):
+        """
+        Return the set of sprites whose rect overlaps another sprite's,
+        found by sweep and prune: sprites are kept sorted by left edge,
+        so each one is only compared with the following sprites that
+        start before its right edge.  Sprite groups are left untouched.
+        왼쪽 x좌표로 정렬한 뒤 x 구간이 겹치는 이웃끼리만 비교해서 다른 스프라이트와 겹친 스프라이트들을 찾는다.
+        """
+        hits = self.sprite_hits
+        hits.clear()
+        sweep = self.sweep_list
+        count = len(sweep)
+        #프레임 사이에 순서가 거의 바뀌지 않으므로 제자리 삽입 정렬이 거의 선형 시간에 끝난다.
+        for i in range(1, count):
+            sprite = sweep[i]
+            left = sprite.rect.left
+            j = i
+            while j and sweep[j - 1].rect.left > left:
+                sweep[j] = sweep[j - 1]
+                j -= 1
+            sweep[j] = sprite
+        for i in range(count):
+            rect = sweep[i].rect
+            right = rect.right
+            for j in range(i + 1, count):
+                other = sweep[j].rect
+                if other.left >= right:
+                    break
+                if rect.colliderect(other):
+                    hits.add(sweep[i])
+                    hits.add(sweep[j])
+        return hits
 
     def reset_after_collision(self, sprite):
         """
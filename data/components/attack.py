@@ -4,11 +4,35 @@ Sprites for attacks.
 import sys
 import pygame as pg
 from .. import setup, tools
+from .. import constants as c
 
 #Python 2/3 compatibility.
 if sys.version_info[0] == 2:
     range = xrange
 
+#explosion sprite sheet에서 잘라낸 프레임들을 저장해두고 모든 Fire가 공유하는 리스트
+EXPLOSION_FRAMES = []
+
+#explosion 프레임 64개를 처음 한 번만 잘라서 화면 형식으로 변환해 반환하는 메소드
+def get_explosion_frames():
+    """
+    Return the 64 explosion frames.  They are cut from the sheet once,
+    converted to the display format with an RLE accelerated colorkey,
+    and shared read-only by every Fire sprite.
+    """
+    if not EXPLOSION_FRAMES:
+        spritesheet = setup.GFX['explosion']
+        for row in range(8):
+            for column in range(8):
+                posx = column * 128
+                posy = row * 128
+                image = tools.get_image(posx, posy, 128, 128,
+                                        spritesheet).convert()
+                image.set_colorkey(c.BLACK, pg.RLEACCEL)
+                EXPLOSION_FRAMES.append(image)
+
+    return EXPLOSION_FRAMES
+
 #fire 클래스: fire 마법에 필요한 애니메이션 구현
 class Fire(pg.sprite.Sprite):
     """
@@ -17,31 +41,19 @@ class Fire(pg.sprite.Sprite):
     #생성자(객체 멤버변수 초기화: 애니메이션에 사용할 이미지, 현재 사용되는 이미지, 이미지와 관련된 정보, 타이머)
     def __init__(self, x, y):
         super(Fire, self).__init__()
-        self.spritesheet = setup.GFX['explosion']
-        self.get_image = tools.get_image
         self.image_list = self.make_image_list()
         self.index = 0
         self.image = self.image_list[self.index]
         self.rect = self.image.get_rect(left=x, top=y)
         self.timer = 0.0
 
-    #fire 마법 애니메이션에 사용할 이미지 리스트 구현
+    #fire 마법 애니메이션에 사용할 이미지 리스트(공유 프레임) 반환
     def make_image_list(self):
         """
-        Make a list of images to cycle through for the
+        Return the shared list of images to cycle through for the
         animation.
         """
-        image_list = []
-
-        for row in range(8):
-            for column in range(8):
-                posx = column * 128
-                posy = row * 128
-                new_image = self.get_image(posx, posy, 128, 128,
-                                           self.spritesheet)
-                image_list.append(new_image)
-
-        return image_list
+        return get_explosion_frames()
 
     #인덱스를 증가시키며 이미지를 업데이트시키는 메소드
     def update(self):
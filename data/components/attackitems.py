@@ -5,10 +5,10 @@ import copy
 import pygame as pg
 from .. import tools, setup
 from .. import constants as c
-import googletrans#구글 번역 API
+from .. import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 #일반공격에 사용되는 검 이미지 애니메이션에 사용하는 클래스
 class Sword(object):
@@ -27,17 +27,17 @@ class Sword(object):
     #sword2 이미지로 이미지 리스트를 생성.
     def make_image_list(self):
         """
-        Make the list of two images for animation.
+        Make the list of two images for animation, scaled 2x once and
+        shared by every Sword.
         """
-        image_list = [tools.get_image(48, 0, 16, 16, self.sprite_sheet),
-                      tools.get_image(0, 0, 22, 16, setup.GFX['sword2'])]
-        return image_list
+        return tools.get_scaled_frames('sword', lambda: [
+            tools.get_image(48, 0, 16, 16, self.sprite_sheet),
+            tools.get_image(0, 0, 22, 16, setup.GFX['sword2'])])
 
-    #해당 객체의 index 멤버변수를 참조하여 이미지리스트에서 이미지를 반환.
+    #해당 객체의 index 멤버변수를 참조하여 이미지리스트에서 2배 크기 이미지를 반환.
     @property
     def image(self):
-        new_image = self.image_list[self.index]
-        return pg.transform.scale2x(new_image)
+        return self.image_list[self.index]
 
     #플레이어의 rect값을 얕은복사하여 bottom, right값 수정하여 반환(검의 위치 지정)
     @property
@@ -73,7 +73,7 @@ class HealthPoints(pg.sprite.Sprite):
         super(HealthPoints, self).__init__()
         self.ether = ether
         self.damage = damage
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 27)
+        self.font = setup.get_font(c.MAIN_FONT, 27)
         self.text_image = self.make_surface(points)
         self.rect = self.text_image.get_rect(x=topleft_pos[0]+20,
                                              bottom=topleft_pos[1]+10)
@@ -94,17 +94,17 @@ class HealthPoints(pg.sprite.Sprite):
         """
         if self.damage:
             if points > 0:
-                text = translator.translate("-{}".format(str(points)), dest='ko').text
-                surface = self.font.render(text, True, c.RED)
+                text = "-{}".format(points)
+                surface = tools.render_text(self.font, text, True, c.RED)
                 return surface
             else:
-                return self.font.render('Miss', True, c.WHITE).convert_alpha()
+                return tools.render_text(self.font, 'Miss', True, c.WHITE).convert_alpha()
         else:
-            text = translator.translate("+{}".format(str(points)), dest='ko').text
+            text = "+{}".format(points)
             if self.ether:
-                surface = self.font.render(text, True, c.PINK)
+                surface = tools.render_text(self.font, text, True, c.PINK)
             else:
-                surface = self.font.render(text, True, c.GREEN)
+                surface = tools.render_text(self.font, text, True, c.GREEN)
 
             return surface
 
@@ -1,14 +1,17 @@
 from __future__ import division
 import itertools
-import math, random, copy, sys
+import random, copy, sys
 import pygame as pg
-from .. import setup, observer
+from .. import setup, observer, tools
 from .. import constants as c
 
 #Python 2/3 compatibility.
 if sys.version_info[0] == 2:
     range = xrange
 
+#sheet 이름별로 잘라낸 애니메이션 프레임을 저장하는 캐시(모든 Person이 읽기 전용으로 공유한다)
+FRAME_CACHE = {}
+
 #게임에 등장하는 모든 ai캐릭터들을 컨트롤하기 위한 클래스(pg.sprite.Sprite 상속)
 class Person(pg.sprite.Sprite):
     """Base class for all world characters
@@ -22,6 +25,9 @@ class Person(pg.sprite.Sprite):
         self.get_image = setup.tools.get_image
         self.spritesheet_dict = self.create_spritesheet_dict(sheet_key)
         self.animation_dict = self.create_animation_dict()
+        self.scaled_dict = tools.get_scaled_frames(sheet_key,
+                                                   lambda: self.spritesheet_dict)
+        self.scaled_animation_dict = self.create_animation_dict(self.scaled_dict)
         self.index = index
         self.direction = direction
         self.image_list = self.animation_dict[self.direction]
@@ -36,7 +42,10 @@ class Person(pg.sprite.Sprite):
         self.move_timer = 0.0
         self.current_time = 0.0
         self.state = state
-        self.blockers = self.set_blockers()
+        self.blocker_rects = [pg.Rect(0, 0, 32, 32), pg.Rect(0, 0, 32, 32)]
+        self.blockers = []
+        self.blocker_version = 0
+        self.set_blockers()
         self.location = self.get_tile_location()
         self.dialogue = ['Location: ' + str(self.location)]
         self.default_direction = direction
@@ -44,14 +53,19 @@ class Person(pg.sprite.Sprite):
         self.wander_box = self.make_wander_box()
         self.observers = [observer.SoundEffects()]
         self.health = 0
-        self.death_image = pg.transform.scale2x(self.image)
+        self.death_image = self.scaled_animation_dict[self.direction][self.index]
         self.battle = None
 
-    #sprite sheet에서 필요한 이미지들을 모아둔 딕셔너리 생성하여 반환
+    #sprite sheet에서 필요한 이미지들을 모아둔 딕셔너리를 반환(sheet별로 한 번만 잘라내어 FRAME_CACHE에 저장하고 공유한다)
     def create_spritesheet_dict(self, sheet_key):
         """
-        Make a dictionary of images from sprite sheet.
+        Make a dictionary of images from sprite sheet.  The frames are cut
+        once per sheet and shared read-only by every Person using it.
         """
+        image_dict = FRAME_CACHE.get(sheet_key)
+        if image_dict is not None:
+            return image_dict
+
         image_list = []
         image_dict = {}
         sheet = setup.GFX[sheet_key]
@@ -68,16 +82,19 @@ class Person(pg.sprite.Sprite):
     
         for key, image in zip(image_keys, image_list):
             image_dict[key] = image
-    
+
+        FRAME_CACHE[sheet_key] = image_dict
         return image_dict
 
     #걷는 애니메이션 구현에 필요한 이미지 리스트의 딕셔너리를 구현하여 반환
     #좌,우,위,아래 방향 이미지들을 각각 2개씩 가짐(걷는 모션 구현)
-    def create_animation_dict(self):
+    #image_dict를 주면(예: 전투용 2배 크기 프레임) 그 이미지들로 만든다
+    def create_animation_dict(self, image_dict=None):
         """
         Return a dictionary of image lists for animation.
         """
-        image_dict = self.spritesheet_dict
+        if image_dict is None:
+            image_dict = self.spritesheet_dict
 
         left_list = [image_dict['facing left 1'], image_dict['facing left 2']]
         right_list = [image_dict['facing right 1'], image_dict['facing right 2']]
@@ -129,41 +146,51 @@ class Person(pg.sprite.Sprite):
         """
         Update sprite.
         """
-        self.blockers = self.set_blockers()
+        self.set_blockers()
         self.current_time = current_time
         self.image_list = self.animation_dict[self.direction]
         state_function = self.state_dict[self.state]
         state_function()
         self.location = self.get_tile_location()
 
-    #스프라이트들(캐릭터들)끼리의 충돌을 막기 위하여 각 캐릭터들의 현재 rect의 위치를 저장하는 메소드
+    #스프라이트들(캐릭터들)끼리의 충돌을 막기 위하여 각 캐릭터들이 차지한 타일을 저장하는 메소드
+    #(blocker_rects 두 개를 재사용하고, 차지한 타일이 바뀔 때만 옮긴 뒤 blocker_version을 올린다)
     def set_blockers(self):
         """
         Sets blockers to prevent collision with other sprites.
         """
-        blockers = []
+        x = self.rect.x
+        y = self.rect.y
+        count = 0
+        x2 = x
+        y2 = y
 
         if self.state == 'resting' or self.state == 'autoresting':
-            blockers.append(pg.Rect(self.rect.x, self.rect.y, 32, 32))
+            count = 1
 
         elif self.state == 'moving' or self.state == 'automoving':
-            if self.rect.x % 32 == 0:
-                tile_float = self.rect.y / float(32)
-                tile1 = (self.rect.x, math.ceil(tile_float)*32)
-                tile2 = (self.rect.x, math.floor(tile_float)*32)
-                tile_rect1 = pg.Rect(tile1[0], tile1[1], 32, 32)
-                tile_rect2 = pg.Rect(tile2[0], tile2[1], 32, 32)
-                blockers.extend([tile_rect1, tile_rect2])
-
-            elif self.rect.y % 32 == 0:
-                tile_float = self.rect.x / float(32)
-                tile1 = (math.ceil(tile_float)*32, self.rect.y)
-                tile2 = (math.floor(tile_float)*32, self.rect.y)
-                tile_rect1 = pg.Rect(tile1[0], tile1[1], 32, 32)
-                tile_rect2 = pg.Rect(tile2[0], tile2[1], 32, 32)
-                blockers.extend([tile_rect1, tile_rect2])
-
-        return blockers
+            if x % 32 == 0:
+                count = 2
+                y = -(-y // 32) * 32
+                y2 = y2 // 32 * 32
+
+            elif y % 32 == 0:
+                count = 2
+                x = -(-x // 32) * 32
+                x2 = x2 // 32 * 32
+
+        first, second = self.blocker_rects
+        if (count != len(self.blockers) or
+                (count and (first.x != x or first.y != y)) or
+                (count == 2 and (second.x != x2 or second.y != y2))):
+            first.x = x
+            first.y = y
+            second.x = x2
+            second.y = y2
+            self.blockers[:] = self.blocker_rects[:count]
+            self.blocker_version += 1
+
+        return self.blockers
 
     #캐릭터의 위치를 pygame의 rect값에서 게임 내의 타일의 위치로 변환해주는 메소드
     def get_tile_location(self):
@@ -186,31 +213,17 @@ class Person(pg.sprite.Sprite):
 
         return [tile_x, tile_y]
 
-    #스프라이트(ai캐릭터)의 이동반경을 제한할 때 사용하는 클래스
-    def make_wander_box(self):
+    #스프라이트(ai캐릭터)의 이동반경을 제한할 때 사용하는 메소드(처음 위치에서 radius 타일 안쪽을 덮는 rect 하나)
+    def make_wander_box(self, radius=2):
         """
-        Make a list of rects that surround the initial location
-        of a sprite to limit his/her wandering.
+        Make a rect covering the tiles within radius of the initial
+        location of a sprite to limit his/her wandering.
         """
         x = int(self.location[0])
         y = int(self.location[1])
-        box_list = []
-        box_rects = []
-
-        for i in range(x-3, x+4):
-            box_list.append([i, y-3])
-            box_list.append([i, y+3])
-
-        for i in range(y-2, y+3):
-            box_list.append([x-3, i])
-            box_list.append([x+3, i])
+        size = (radius*2 + 1) * 32
 
-        for box in box_list:
-            left = box[0]*32
-            top = box[1]*32
-            box_rects.append(pg.Rect(left, top, 32, 32))
-
-        return box_rects
+        return pg.Rect((x-radius)*32, (y-radius)*32, size, size)
 
     #player가 타일들 사이에서 움직이지 않을 때 타일의 중앙으로 이동(correct_Position 호출) 시켜주는 메소드
     def resting(self):
@@ -360,8 +373,7 @@ class Person(pg.sprite.Sprite):
         self.rect.x += self.x_vel
 
         if self.x_vel == FAST_FORWARD:
-            self.image = self.spritesheet_dict['facing left 1']
-            self.image = pg.transform.scale2x(self.image)
+            self.image = self.scaled_dict['facing left 1']
             if self.rect.x <= self.origin_pos[0] - 110:
                 self.x_vel = FAST_BACK
                 self.notify(c.ENEMY_DAMAGED)
@@ -370,8 +382,7 @@ class Person(pg.sprite.Sprite):
                 self.rect.x = self.origin_pos[0]
                 self.x_vel = 0
                 self.state = 'battle resting'
-                self.image = self.spritesheet_dict['facing left 2']
-                self.image = pg.transform.scale2x(self.image)
+                self.image = self.scaled_dict['facing left 2']
                 self.notify(c.PLAYER_FINISHED_ATTACK)
 
     #적(ai캐릭터)를 attack_state(공격 상태)로 바꿔주는 메소드
@@ -456,10 +467,7 @@ class Person(pg.sprite.Sprite):
         X_VEL = 5
         self.rect.x += X_VEL
         self.direction = 'right'
-        self.small_image_list = self.animation_dict[self.direction]
-        self.image_list = []
-        for image in self.small_image_list:
-            self.image_list.append(pg.transform.scale2x(image))
+        self.image_list = self.scaled_animation_dict[self.direction]
         self.animation()
 
     #player가 전투 승리 시 춤을 추는 상태로 전환해주는 메소드
@@ -467,10 +475,7 @@ class Person(pg.sprite.Sprite):
         """
         Post Victory Dance.
         """
-        self.small_image_list = self.animation_dict[self.direction]
-        self.image_list = []
-        for image in self.small_image_list:
-            self.image_list.append(pg.transform.scale2x(image))
+        self.image_list = self.scaled_animation_dict[self.direction]
         self.animation(500)
 
     #대상이 피격 시 뒤로 넉백되는 애니메이션 구현하는 메소드(앞으로 -2만큼 이동 후 원위치)
@@ -569,7 +574,7 @@ class Player(Person):
         self.current_time = current_time
         self.damage_animation()
         self.healing_animation()
-        self.blockers = self.set_blockers()
+        self.set_blockers()
         self.keys = keys
         self.check_for_input()
         state_function = self.state_dict[self.state]
@@ -582,8 +587,7 @@ class Player(Person):
         Put a red overlay over sprite to indicate damage.
         """
         if self.damaged:
-            self.image = copy.copy(self.spritesheet_dict['facing left 2'])
-            self.image = pg.transform.scale2x(self.image).convert_alpha()
+            self.image = self.scaled_dict['facing left 2'].convert_alpha()
             damage_image = copy.copy(self.image).convert_alpha()
             damage_image.fill((255, 0, 0, self.damage_alpha), special_flags=pg.BLEND_RGBA_MULT)
             self.image.blit(damage_image, (0, 0))
@@ -598,8 +602,7 @@ class Player(Person):
                     self.damage_alpha = 0
                     self.damaged = False
                     self.fade_in = True
-                    self.image = self.spritesheet_dict['facing left 2']
-                    self.image = pg.transform.scale2x(self.image)
+                    self.image = self.scaled_dict['facing left 2']
 
     #player가 힐링포션 사용 시 초록색으로 변하는 애니메이션을 구현한 메소드
     def healing_animation(self):
@@ -607,8 +610,7 @@ class Player(Person):
         Put a green overlay over sprite to indicate healing.
         """
         if self.healing:
-            self.image = copy.copy(self.spritesheet_dict['facing left 2'])
-            self.image = pg.transform.scale2x(self.image).convert_alpha()
+            self.image = self.scaled_dict['facing left 2'].convert_alpha()
             healing_image = copy.copy(self.image).convert_alpha()
             healing_image.fill((0, 255, 0, self.healing_alpha), special_flags=pg.BLEND_RGBA_MULT)
             self.image.blit(healing_image, (0, 0))
@@ -623,8 +625,7 @@ class Player(Person):
                     self.healing_alpha = 0
                     self.healing = False
                     self.fade_in = True
-                    self.image = self.spritesheet_dict['facing left 2']
-                    self.image = pg.transform.scale2x(self.image)
+                    self.image = self.scaled_dict['facing left 2']
 
     #player가 대기 상태일 때 사용자의 입력을 받는 메소드(위 키, 아래 키, 왼쪽 키, 오른쪽 키)
     def check_for_input(self):
@@ -681,9 +682,12 @@ class Chest(Person):
         """
         Make a dictionary for the sprite's images.
         """
-        sprite_sheet = setup.GFX['treasurechest']
-        image_dict = {'closed': self.get_image(0, 0, 32, 32, sprite_sheet),
-                      'opened': self.get_image(32, 0, 32, 32, sprite_sheet)}
+        image_dict = FRAME_CACHE.get('treasurechest closed/opened')
+        if image_dict is None:
+            sprite_sheet = setup.GFX['treasurechest']
+            image_dict = {'closed': self.get_image(0, 0, 32, 32, sprite_sheet),
+                          'opened': self.get_image(32, 0, 32, 32, sprite_sheet)}
+            FRAME_CACHE['treasurechest closed/opened'] = image_dict
 
         return image_dict
 
@@ -700,12 +704,47 @@ class Chest(Person):
     #상자의 상태를 지정해주는 메소드
     def update(self, current_time, *args):
         """Implemented by inheriting classes"""
-        self.blockers = self.set_blockers()
+        self.set_blockers()
         self.current_time = current_time
         state_function = self.state_dict[self.state]
         state_function()
         self.location = self.get_tile_location()
 
 
+#TMX 맵의 sprite type별로 필요한 캐릭터 하나만 만드는 팩토리 함수들을 등록한 딕셔너리
+#팩토리 함수는 (x, y, direction, index, id)를 받는다
+SPRITE_FACTORIES = {
+    'oldman': lambda x, y, direction, index, id:
+        Person('oldman', x, y, direction),
+    'bluedressgirl': lambda x, y, direction, index, id:
+        Person('femalevillager', x, y, direction, 'resting', 1),
+    'femalewarrior': lambda x, y, direction, index, id:
+        Person('femvillager2', x, y, direction, 'autoresting'),
+    'devil': lambda x, y, direction, index, id:
+        Person('devil', x, y, 'down', 'autoresting'),
+    'oldmanbrother': lambda x, y, direction, index, id:
+        Person('oldmanbrother', x, y, direction),
+    'soldier': lambda x, y, direction, index, id:
+        Person('soldier', x, y, direction, 'resting', index),
+    'king': lambda x, y, direction, index, id:
+        Person('king', x, y, direction),
+    'evilwizard': lambda x, y, direction, index, id:
+        Person('evilwizard', x, y, direction),
+    'treasurechest': lambda x, y, direction, index, id:
+        Chest(x, y, id)}
+
+
+#TMX sprite type에 대한 팩토리 함수를 등록하는 메소드
+def register_sprite(sprite_type, factory):
+    """
+    Register factory(x, y, direction, index, id) for a TMX sprite type.
+    """
+    SPRITE_FACTORIES[sprite_type] = factory
 
 
+#TMX sprite type에 등록된 팩토리로 캐릭터 하나만 만들어 반환하는 메소드
+def make_sprite(sprite_type, x, y, direction='down', index=0, id=None):
+    """
+    Construct only the sprite registered for sprite_type.
+    """
+    return SPRITE_FACTORIES[sprite_type](x, y, direction, index, id)
@@ -3,10 +3,10 @@ import copy
 import pygame as pg
 from .. import setup, observer, tools
 from .. import constants as c
-import googletrans#구글 번역 API
+from .. import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 #다음 페이지가 있다는 것을 알려주는 깜빡거리는 화살표를 구현하는 클래스
 class NextArrow(pg.sprite.Sprite):
@@ -22,17 +22,20 @@ class NextArrow(pg.sprite.Sprite):
 class DialogueBox(object):
     """Text box used for dialogue"""
     #객체 멤버변수 초기화
-    def __init__(self, dialogue, index=0, image_key='dialoguebox', item=None):
+    def __init__(self, dialogue, index=0, image_key='dialoguebox', item=None,
+                 typewriter=c.DIALOGUE_TYPEWRITER):
         self.item = item
         self.bground = setup.GFX[image_key]
         self.rect = self.bground.get_rect(centerx=400)
         self.arrow_timer = 0.0
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
         self.dialogue_list = dialogue
         self.index = index
-        self.image = self.make_dialogue_box_image()
+        self.typewriter = typewriter
+        self.start_time = None
         self.arrow = NextArrow()
-        self.check_to_draw_arrow()
+        self.page = None
+        self.image = self.make_dialogue_box_image()
         self.done = False
         self.allow_input = False
         self.name = image_key
@@ -41,22 +44,57 @@ class DialogueBox(object):
         self.notify(self, c.CLICK)
 
     #대화박스의 이미지를 가져와  텍스트와 함께 surface에 blit해주는 메소드
+    #만든 이미지는 페이지(index)나 번역문이 바뀔 때까지 그대로 사용한다.
     def make_dialogue_box_image(self):
         """
-        Make the image of the dialogue box.
+        Make the image of the dialogue box for the current page.  In
+        typewriter mode the text is left out and revealed by reveal_text.
         """
         image = pg.Surface(self.rect.size)
         image.set_colorkey(c.BLACK)
         image.blit(self.bground, (0, 0))
 
-        dialogue_image = self.font.render(self.dialogue_list[self.index],
-                                          True,
-                                          c.NEAR_BLACK)
-        dialogue_rect = dialogue_image.get_rect(left=50, top=50)
-        image.blit(dialogue_image, dialogue_rect)
+        #번역이 아직 도착하지 않았으면 원문을 그리고, 번역문이 도착하면 한 번 다시 그린다.
+        dialogue = translation.translate_async(self.dialogue_list[self.index])
+        self.page = (self.index, dialogue)
+        self.dialogue_image = tools.render_text(self.font, dialogue,
+                                               True,
+                                               c.NEAR_BLACK)
+        self.dialogue_rect = self.dialogue_image.get_rect(left=50, top=50)
+        self.revealed = 0
+        self.revealed_width = 0
+        if self.typewriter:
+            self.reveal_text(image, self.revealed)
+        else:
+            self.reveal_text(image, len(dialogue))
 
+        self.image = image
+        self.check_to_draw_arrow()
         return image
 
+    #타자기 모드에서 count번째 글자까지 새로 드러난 영역만 이미지에 blit하는 메소드
+    def reveal_text(self, image, count):
+        """
+        Blit the part of the rendered page between the last revealed
+        character and character count onto image.
+        """
+        text = self.page[1]
+        count = min(count, len(text))
+        if count <= self.revealed:
+            return
+        width = self.font.size(text[:count])[0] if count < len(text) \
+            else self.dialogue_rect.width
+        area = pg.Rect(self.revealed_width, 0,
+                       width - self.revealed_width, self.dialogue_rect.height)
+        image.blit(self.dialogue_image,
+                   (self.dialogue_rect.x + area.x, self.dialogue_rect.y), area)
+        self.revealed = count
+        self.revealed_width = width
+
+    #텍스트가 모두 드러났는지 확인하는 메소드
+    def fully_revealed(self):
+        return self.revealed >= len(self.page[1])
+
     #텍스트,텍스트 박스를 업데이트 해주는 메소드
     def update(self, keys, current_time):
         """Updates scrolling text"""
@@ -64,18 +102,30 @@ class DialogueBox(object):
         self.draw_box(current_time)
         self.terminate_check(keys)
     
-    #다음 대화로 넘어갈 때 새로 텍스트박스와 텍스트를 그려주는 메소드(make_dialogue_box_image() 호출)
-    #다음 페이지가 있는지 확인하여 화살표를 그릴지 결정한다.(check_to_draw_arrow() 호출)
+    #페이지(index)나 번역문이 바뀌었을 때만 텍스트박스와 텍스트를 새로 그려주는 메소드(make_dialogue_box_image() 호출)
+    #타자기 모드에서는 새로 드러난 글자 영역만 그린다.
     def draw_box(self, current_time, x=400):
         """Reveal dialogue on textbox"""
-        self.image = self.make_dialogue_box_image()
-        self.check_to_draw_arrow()
+        dialogue = translation.translate_async(self.dialogue_list[self.index])
+        if self.page != (self.index, dialogue):
+            self.make_dialogue_box_image()
+            self.start_time = current_time
+        if self.start_time is None:
+            self.start_time = current_time
+        if not self.fully_revealed():
+            elapsed = current_time - self.start_time
+            self.reveal_text(self.image,
+                             int(elapsed * c.DIALOGUE_REVEAL_SPEED / 1000.0))
 
     #텍스트가 마지막인지 확인하는 메소드(TextHandler에서 활용하는 done, allow_input 값 변경)
     def terminate_check(self, keys):
         """Remove textbox from sprite group after 2 seconds"""
         if keys[pg.K_SPACE] and self.allow_input:
-            self.done = True
+            if self.fully_revealed():
+                self.done = True
+            else:
+                self.reveal_text(self.image, len(self.page[1]))
+                self.allow_input = False
 
         if not keys[pg.K_SPACE]:
             self.allow_input = True
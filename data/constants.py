@@ -41,6 +41,8 @@ PINK = 208, 32, 144
 TRANSITION_COLOR = BLACK_BLUE
 
 MAIN_FONT = 'DroidSans'
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
+MAP_CACHE_BYTES = 32 * 1024 * 1024
 
 #BATTLE STATES
 
@@ -91,8 +93,17 @@ MISS = 'whoosh'
 TRANSITION_SPEED = 35 
 DEATH_TRANSITION_SPEED = 5
 
+#DIALOGUE
+
+DIALOGUE_TYPEWRITER = False
+DIALOGUE_REVEAL_SPEED = 40  #characters per second
+
 #LEVEL STATES
 
+REPORT_LEVEL_LOADS = False  #print the objects each level startup creates
+CULL_MARGIN = 64  #sprites within this many pixels of the viewport update every frame
+OFFSCREEN_UPDATE_INTERVAL = 4  #sprites farther away run their AI once every this many frames
+
 NORMAL = 'normal'
 TRANSITION_IN = 'transition in'
 TRANSITION_OUT = 'transition out'
@@ -9,10 +9,10 @@ import pygame as pg
 from . import setup, observer
 from . import constants as c
 from . import tools
-import googletrans#구글 번역 API
+from . import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 #Python 2/3 compatibility.
 #Python 2/3 호환성.
@@ -137,8 +137,8 @@ class QuickStats(pg.sprite.Sprite):
         self.game_data = game_data
         self.health = game_data['player stats']['health']
         self.stats = self.game_data['player stats']
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
-        self.small_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 18)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
+        self.small_font = setup.get_font(c.MAIN_FONT, 18)
         self.image, self.rect = self.make_image()
 
     def make_image(self):
@@ -156,15 +156,16 @@ class QuickStats(pg.sprite.Sprite):
         surface.blit(image, (0, 0))
 
         for i, stat in enumerate(stat_list):
-            first_letter = stat[0].upper()
-            rest_of_letters = stat[1:]
             if stat in magic_health_list:
                 current = self.stats[stat]['current']
                 max = self.stats[stat]['maximum']
-                text = translator = translator.translate("{}{}: {}/{}".format(first_letter, rest_of_letters, current, max), dest='ko').text
+                if stat == 'health':
+                    text = translator.format("Health: {}/{}", current, max, dest='ko')
+                else:
+                    text = translator.format("Magic: {}/{}", current, max, dest='ko')
             elif stat == 'GOLD':
-                text = translator.translate("Gold: {}".format(self.inventory[stat]['quantity']), dest='ko').text
-            render = self.small_font.render(text, True, c.NEAR_BLACK)
+                text = translator.format("Gold: {}", self.inventory[stat]['quantity'], dest='ko')
+            render = tools.render_text(self.small_font, text, True, c.NEAR_BLACK)
             x = 26
             y = 45 + (i*30)
             text_rect = render.get_rect(x=x,
@@ -200,10 +201,9 @@ class InfoBox(pg.sprite.Sprite):
         self.player_stats = player_stats
         self.attack_power = self.get_attack_power()
         self.defense_power = self.get_defense_power()
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
-        self.big_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 24)
-        self.title_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 28)
-        self.title_font.set_underline(True)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
+        self.big_font = setup.get_font(c.MAIN_FONT, 24)
+        self.title_font = setup.get_font(c.MAIN_FONT, 28, underline=True)
         self.get_tile = tools.get_tile
         self.sword = self.get_tile(48, 0, setup.GFX['shopsigns'], 16, 16, 2)
         self.shield = self.get_tile(32, 0, setup.GFX['shopsigns'], 16, 16, 2)
@@ -256,31 +256,34 @@ class InfoBox(pg.sprite.Sprite):
         플레이어의 기본 통계 표시
         """
         title = 'STATS'
-        stat_list = [translator.translate('Level', dest='ko').text, translator.translate('experience to next level', dest='ko').text,
-                     translator.translate('health', dest='ko').text, translator.translate('magic', dest='ko').text, translator.translate('Attack Power', dest='ko').text, 
-                     translator.translate('Defense Power', dest='ko').text, translator.translate('gold', dest='ko').text]
+        stat_list = ['Level', 'experience to next level',
+                     'health', 'magic', 'Attack Power',
+                     'Defense Power', 'gold']
         attack_power = 5
         surface, rect = self.make_blank_info_box(title)
 
+        #통계 이름은 player_stats의 키이므로 번역하지 않고, 화면에 표시할 템플릿만 번역한다.
         for i, stat in enumerate(stat_list):
-            if stat == translator.translate('health', dest='ko').text or stat == translator.translate('magic', dest='ko').text:
-                text = translator.translate("{}{}: {} / {}".format(stat[0].upper(),
-                                              stat[1:],
-                                              str(self.player_stats[stat]['current']),
-                                              str(self.player_stats[stat]['maximum'])), dest='ko').text
-            elif stat == translator.translate('experience to next level', dest='ko').text:
-                text = translator.translate("{}{}: {}".format(stat[0].upper(),
-                                         stat[1:],
-                                         self.player_stats[stat]), dest='ko').text
-            elif stat == translator.translate('Attack Power', dest='ko').text:
-                text = translator.translate("{}: {}".format(stat, self.get_attack_power()), dest='ko').text
-            elif stat == translator.translate('Defense Power', dest='ko').text:
-                text = translator.translate("{}: {}".format(stat, self.get_defense_power()), dest='ko').text
-            elif stat == translator.translate('gold', dest='ko').text:
-                text = translator.translate("Gold: {}".format(self.inventory['GOLD']['quantity']), dest='ko').text
+            if stat == 'health':
+                text = translator.format("Health: {} / {}",
+                                         self.player_stats[stat]['current'],
+                                         self.player_stats[stat]['maximum'], dest='ko')
+            elif stat == 'magic':
+                text = translator.format("Magic: {} / {}",
+                                         self.player_stats[stat]['current'],
+                                         self.player_stats[stat]['maximum'], dest='ko')
+            elif stat == 'experience to next level':
+                text = translator.format("Experience to next level: {}",
+                                         self.player_stats[stat], dest='ko')
+            elif stat == 'Attack Power':
+                text = translator.format("Attack Power: {}", self.get_attack_power(), dest='ko')
+            elif stat == 'Defense Power':
+                text = translator.format("Defense Power: {}", self.get_defense_power(), dest='ko')
+            elif stat == 'gold':
+                text = translator.format("Gold: {}", self.inventory['GOLD']['quantity'], dest='ko')
             else:
-                text = translator.translate("{}: {}".format(stat, str(self.player_stats[stat])), dest='ko').text
-            text_image = self.font.render(text, True, c.NEAR_BLACK)
+                text = translator.format("Level: {}", self.player_stats[stat], dest='ko')
+            text_image = tools.render_text(self.font, text, True, c.NEAR_BLACK)
             text_rect = text_image.get_rect(x=50, y=80+(i*50))
             surface.blit(text_image, text_rect)
 
@@ -372,7 +375,7 @@ class InfoBox(pg.sprite.Sprite):
                                        self.inventory[item]['quantity'])
             else:
                 text = "{}".format(self.slots[coord])
-            text_image = self.font.render(text, True, c.NEAR_BLACK)
+            text_image = tools.render_text(self.font, text, True, c.NEAR_BLACK)
             text_rect = text_image.get_rect(topleft=coord)
             surface.blit(text_image, text_rect)
 
@@ -394,7 +397,7 @@ class InfoBox(pg.sprite.Sprite):
         surface, rect = self.make_blank_info_box(title)
 
         for i, item in enumerate(item_list):
-            text_image = self.font.render(item, True, c.NEAR_BLACK)
+            text_image = tools.render_text(self.font, item, True, c.NEAR_BLACK)
             text_rect = text_image.get_rect(x=100, y=80+(i*50))
             surface.blit(text_image, text_rect)
 
@@ -423,7 +426,7 @@ class InfoBox(pg.sprite.Sprite):
         surface.set_colorkey(c.BLACK)
         surface.blit(image, (0,0))
 
-        title_image = self.title_font.render(title, True, c.NEAR_BLACK)
+        title_image = tools.render_text(self.title_font, title, True, c.NEAR_BLACK)
         title_rect = title_image.get_rect(centerx=centerx, y=30)
         surface.blit(title_image, title_rect)
 
@@ -449,7 +452,7 @@ class InfoBox(pg.sprite.Sprite):
 # 선택된 박스 클래스
 class SelectionBox(pg.sprite.Sprite):
     def __init__(self):
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
         self.image, self.rect = self.make_image()
 
     # 이미지 만들기 메소드
@@ -463,7 +466,7 @@ class SelectionBox(pg.sprite.Sprite):
         surface.blit(image, (0, 0))
 
         for i, choice in enumerate(choices):
-            choice_image = self.font.render(choice, True, c.NEAR_BLACK)
+            choice_image = tools.render_text(self.font, choice, True, c.NEAR_BLACK)
             choice_rect = choice_image.get_rect(x=100, y=(15 + (i * 45)))
             surface.blit(choice_image, choice_rect)
 
@@ -491,6 +494,8 @@ class MenuGui(object):
         self.arrow = SmallArrow(self.info_box,self.inventory)
         self.arrow_index = 0
         self.allow_input = False
+        self.changed = True
+        self.redraw = True
 
     def check_for_input(self, keys):
         """
@@ -503,11 +508,13 @@ class MenuGui(object):
                     self.notify(c.CLICK)
                     self.arrow_index += 1
                     self.allow_input = False
+                    self.redraw = True
             elif keys[pg.K_UP]:         #방향키 위
                 if self.arrow_index > 0:
                     self.notify(c.CLICK)
                     self.arrow_index -= 1
                     self.allow_input = False
+                    self.redraw = True
             elif keys[pg.K_RIGHT]:      #방향키 오른쪽
                 if self.info_box.state == 'items':
                     if not self.arrow.state == 'itemsubmenu':
@@ -520,12 +527,14 @@ class MenuGui(object):
                         self.arrow_index = 0
                     self.arrow.state = 'magicsubmenu'
                 self.allow_input = False
+                self.redraw = True
 
             elif keys[pg.K_LEFT]:   #방향키 왼쪽
                 self.notify(c.CLICK)
                 self.arrow.state = 'selectmenu'
                 self.arrow_index = 0
                 self.allow_input = False
+                self.redraw = True
             elif keys[pg.K_SPACE]:  # 방향키 스페이스바
                 self.notify(c.CLICK2)
                 if self.arrow.state == 'selectmenu':
@@ -539,6 +548,7 @@ class MenuGui(object):
                         self.arrow_index = 0
                     elif self.arrow_index == 2:
                         self.info_box.state = 'stats'
+                    self.redraw = True
                 elif self.arrow.state == 'itemsubmenu':
                     self.select_item()
                 elif self.arrow.state == 'magicsubmenu':
@@ -588,15 +598,19 @@ class MenuGui(object):
                 value = 30
                 self.drink_potion(potion, stat, value)
             elif self.info_box.slots[(posx, posy)][:10] == translator.translate('Long Sword', dest='ko').text:
+                self.redraw = True
                 self.inventory['equipped weapon'] = translator.translate('Long Sword', dest='ko').text
             elif self.info_box.slots[(posx, posy)][:6] == translator.translate('Rapier', dest='ko').text:
+                self.redraw = True
                 self.inventory['equipped weapon'] = translator.translate('Rapier', dest='ko').text
             elif self.info_box.slots[(posx, posy)][:13] == translator.translate('Wooden Shield', dest='ko').text:
+                self.redraw = True
                 if translator.translate('Wooden Shield', dest='ko').text in self.inventory['equipped armor']:
                     self.inventory['equipped armor'].remove(translator.translate('Wooden Shield', dest='ko').text)
                 else:
                     self.inventory['equipped armor'].append(translator.translate('Wooden Shield', dest='ko').text)
             elif self.info_box.slots[(posx, posy)][:10] == translator.translate('Chain Mail', dest='ko').text:
+                self.redraw = True
                 if 'Chain Mail' in self.inventory['equipped armor']:
                     self.inventory['equipped armor'].remove(translator.translate('Chain Mail', dest='ko').text)
                 else:
@@ -628,6 +642,7 @@ class MenuGui(object):
         if health['current'] != health['maximum']:  # 현재 체력이 최대 체력이 아니라면
             if magic['current'] >= inventory['Cure']['magic points']:   #현재 마법 포인트가 치료할 수 있는 마법 포인트보다 클 떄
                 self.notify(c.POWERUP)
+                self.redraw = True
                 magic['current'] -= inventory['Cure']['magic points']
                 health['current'] += inventory['Cure']['power']
                 if health['current'] > health['maximum']:   # 현재 체력이 최대 체력보다 높게 추가되었다면
@@ -640,6 +655,7 @@ class MenuGui(object):
         """
         if stat['current'] != stat['maximum']:  #현재 상태가 최대 상태가 아닐 때
             self.notify(c.POWERUP)
+            self.redraw = True
             self.inventory[potion]['quantity'] -= 1 # 물약 갯수 -1
             stat['current'] += value                # 현재 상태에 value만큼 더하기
             if stat['current'] > stat['maximum']:   #현재 상태가 최대 상태보다 크게 더해졌을 때
@@ -654,9 +670,11 @@ class MenuGui(object):
         self.info_box.update()
         self.gold_box.update()
         self.arrow.update(self.arrow_index)
+        #지난 입력으로 바뀐 내용이 이번 프레임에 그려지므로 그때 화면을 다시 반영한다.
+        self.changed = self.redraw
+        self.redraw = False
         self.check_for_input(keys)
 
-
     def draw(self, surface):
         """
         그리기 메소드
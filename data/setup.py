@@ -34,7 +34,33 @@ GFX = tools.load_all_gfx(os.path.join('resources', 'graphics'))
 SFX = tools.load_all_sfx(os.path.join('resources', 'sound'))
 TMX = tools.load_all_tmx(os.path.join('resources', 'tmx'))
 
-FONT = pg.font.Font(FONTS['Fixedsys500c'], 20)
+# 폰트 레지스트리 : (글꼴, 크기, 스타일)마다 Font 객체를 한 번만 만들어 모든 GUI가 공유한다.
+FONT_REGISTRY = {}
+
+
+def get_font(name, size, bold=False, italic=False, underline=False):
+    """
+    Return the shared Font for a face in FONTS, size and style, opening
+    the TTF file only the first time.  Shared fonts must not be restyled
+    by callers; ask for the style here instead.
+    """
+    key = (name, size, bold, italic, underline)
+    font = FONT_REGISTRY.get(key)
+    if font is None:
+        font = pg.font.Font(FONTS[name], size)
+        font.set_bold(bold)
+        font.set_italic(italic)
+        font.set_underline(underline)
+        FONT_REGISTRY[key] = font
+    return font
+
+
+def font_count():
+    """Return how many Font objects the registry has created."""
+    return len(FONT_REGISTRY)
+
+
+FONT = get_font('Fixedsys500c', 20)
 
 
 
@@ -9,13 +9,13 @@ A Gui object is created and updated by the shop state.
 import sys
 import pickle # pickle이란 텍스트 데이터가 아닌 파이썬 객체를 파일로 저장하는 모듈
 import pygame as pg
-from . import setup, observer
+from . import setup, observer, tools
 from . components import textbox
 from . import constants as c
-import googletrans#구글 번역 API
+from . import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 
 #Python 2/3 compatibility.
@@ -41,7 +41,7 @@ class Gui(object):
         self.no_selling = ['Inn', 'magic shop']
         self.weapon_list = [translator.translate('Long Sword', dest='ko').text, translator.translate('Rapier', dest='ko').text]
         self.armor_list = [translator.translate('Chain Mail', dest='ko').text, translator.translate('Wooden Shield', dest='ko').text]
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
         self.index = 0
         self.timer = 0.0
         self.allow_input = False
@@ -89,7 +89,7 @@ class Gui(object):
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
         surface.blit(image, rect)
-        dialogue = self.font.render(dialogue_list[index],
+        dialogue = tools.render_text(self.font, dialogue_list[index],
                                     True,
                                     c.NEAR_BLACK)
         dialogue_rect = dialogue.get_rect(left=50, top=50)
@@ -119,8 +119,8 @@ class Gui(object):
         surface.set_colorkey(c.BLACK)
         surface.blit(image, (0, 0))
         gold = self.player_inventory['GOLD']['quantity']
-        text = translator.translate('Gold: ' + str(gold), dest='ko').text
-        text_render = self.font.render(text, True, c.NEAR_BLACK)
+        text = translator.format('Gold: {}', gold, dest='ko')
+        text_render = tools.render_text(self.font, text, True, c.NEAR_BLACK)
         text_rect = text_render.get_rect(x=80, y=60)
 
         surface.blit(text_render, text_rect)
@@ -142,20 +142,20 @@ class Gui(object):
         surface.blit(image, (0, 0))
 
         if len(choices) == 2:
-            choice1 = self.font.render(choices[0], True, c.NEAR_BLACK)
+            choice1 = tools.render_text(self.font, choices[0], True, c.NEAR_BLACK)
             choice1_rect = choice1.get_rect(x=200, y=35)
-            choice2 = self.font.render(choices[1], True, c.NEAR_BLACK)
+            choice2 = tools.render_text(self.font, choices[1], True, c.NEAR_BLACK)
             choice2_rect = choice2.get_rect(x=200, y=75)
 
             surface.blit(choice1, choice1_rect)
             surface.blit(choice2, choice2_rect)
 
         elif len(choices) == 3:
-            choice1 = self.font.render(choices[0], True, c.NEAR_BLACK)
+            choice1 = tools.render_text(self.font, choices[0], True, c.NEAR_BLACK)
             choice1_rect = choice1.get_rect(x=200, y=15)
-            choice2 = self.font.render(choices[1], True, c.NEAR_BLACK)
+            choice2 = tools.render_text(self.font, choices[1], True, c.NEAR_BLACK)
             choice2_rect = choice2.get_rect(x=200, y=55)
-            choice3 = self.font.render(choices[2], True, c.NEAR_BLACK)
+            choice3 = tools.render_text(self.font, choices[2], True, c.NEAR_BLACK)
             choice3_rect = choice3.get_rect(x=200, y=95)
 
             surface.blit(choice1, choice1_rect)
@@ -556,10 +556,10 @@ class Gui(object):
         for item in self.items:
             if item['type'] in self.player_inventory:
                 name = item['type']
-                price = translator.translate(" (" + str(item['price'] / 2) + " gold)", dest='ko').text
-                choices.append(name + price)
+                price = translator.format(" ({} gold)", item['price'] / 2, dest='ko')
+                choices.append(translator.translate(name, dest='ko').text + price)
                 item_list.append(name)
-        choices.append('Cancel')
+        choices.append(translator.translate('Cancel', dest='ko').text)
         self.dialogue_box = self.make_dialogue_box(dialogue, 0)
         self.selection_box = self.make_selection_box(choices)
 
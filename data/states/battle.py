@@ -8,7 +8,7 @@ try:
 except ImportError:
        izip = zip
 import pygame as pg
-from .. import tools, battlegui, observer, setup
+from .. import tools, battlegui, observer, setup, translation
 from .. components import person, attack, attackitems
 from .. import constants as c
 
@@ -24,6 +24,7 @@ class Battle(tools._State): #적과의 전투 돌입 시에 상태를 다룰 수
         self.name = 'battle' #상태의 이름을 battle로 설정한다.
         self.music = setup.MUSIC['high_action'] #이 상태에 돌입 시 노래 high_action을 재생한다.
         self.volume = 0.4 #볼륨 설정
+        self.overlay = True #지역 상태를 없애지 않고 멈춰둔 채 전투에 들어간다.
 
     def startup(self, current_time, game_data):
         """
@@ -67,9 +68,17 @@ class Battle(tools._State): #적과의 전투 돌입 시에 상태를 다룰 수
         self.enemies_to_attack = []
         self.action_selected = False
         self.just_leveled_up = False
-        self.transition_rect = setup.SCREEN.get_rect()
         self.transition_alpha = 255
         self.temp_magic = self.game_data['player stats']['magic']['current']
+        if 'Fire Blast' in self.inventory:
+            attack.get_explosion_frames()
+
+    def translation_strings(self):
+        """
+        Return the battle GUI text.
+        전투 화면에 표시할 문자열 목록을 반환한다.
+        """
+        return translation.module_literals(battlegui, attackitems)
 
     def make_player_action_dict(self):
         """
@@ -180,7 +189,7 @@ class Battle(tools._State): #적과의 전투 돌입 시에 상태를 다룰 수
 
         for i, enemy in enumerate(enemy_group):
             enemy.rect.topleft = pos_list[i]
-            enemy.image = pg.transform.scale2x(enemy.image)
+            enemy.image = enemy.scaled_animation_dict[enemy.direction][enemy.index]
             enemy.index = i
             enemy.level = self.make_enemy_level_dict()[self.previous]
             if enemy.name == 'evilwizard':
@@ -198,7 +207,7 @@ class Battle(tools._State): #적과의 전투 돌입 시에 상태를 다룰 수
         전투할 때 플레이어 캐릭터 스프라이트를 만든다.
         """
         player = person.Player('left', self.game_data, 630, 220, 'battle resting', 1)
-        player.image = pg.transform.scale2x(player.image)
+        player.image = player.scaled_animation_dict[player.direction][player.index]
         return player
 
     def make_selection_state_dict(self):
@@ -460,30 +469,20 @@ class Battle(tools._State): #적과의 전투 돌입 시에 상태를 다룰 수
         화면이 점점 거매지거나 나타나는 효과를 준다.
         """
         if self.state == 'transition in':
-
-            transition_image = pg.Surface(self.transition_rect.size)
-            transition_image.fill(c.TRANSITION_COLOR)
-            transition_image.set_alpha(self.transition_alpha)
-            surface.blit(transition_image, self.transition_rect)
+            tools.draw_fade(surface, self.transition_alpha)
             self.transition_alpha -= c.TRANSITION_SPEED 
             if self.transition_alpha <= 0:
                 self.state = c.SELECT_ACTION
                 self.transition_alpha = 0
 
         elif self.state == 'transition out':
-            transition_image = pg.Surface(self.transition_rect.size)
-            transition_image.fill(c.TRANSITION_COLOR)
-            transition_image.set_alpha(self.transition_alpha)
-            surface.blit(transition_image, self.transition_rect)
+            tools.draw_fade(surface, self.transition_alpha)
             self.transition_alpha += c.TRANSITION_SPEED 
             if self.transition_alpha >= 255:
                 self.done = True
 
         elif self.state == c.DEATH_FADE:
-            transition_image = pg.Surface(self.transition_rect.size)
-            transition_image.fill(c.TRANSITION_COLOR)
-            transition_image.set_alpha(self.transition_alpha)
-            surface.blit(transition_image, self.transition_rect)
+            tools.draw_fade(surface, self.transition_alpha)
             self.transition_alpha += c.DEATH_TRANSITION_SPEED
             if self.transition_alpha >= 255:
                 self.done = True
@@ -11,7 +11,7 @@ class CreditEntry(object):
     """
     def __init__(self, level):#해당 객체에 대한 인스턴스를 생성한다.
         self.alpha = 0
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
         self.credit_sprites = self.make_credits()
         self.index = 0
         self.current_credit = self.credit_sprites[self.index]
@@ -59,7 +59,7 @@ class CreditEntry(object):
             subcredit_list = []
             for i, subcredit in enumerate(credit):
                 text_sprite = pg.sprite.Sprite()
-                text_sprite.text_image = self.font.render(subcredit, True, c.WHITE)
+                text_sprite.text_image = tools.render_text(self.font, subcredit, True, c.WHITE)
                 text_sprite.rect = text_sprite.text_image.get_rect(centerx = 400,
                                                                    y=100+(i*40))
                 text_sprite.image = pg.Surface(text_sprite.rect.size).convert()
@@ -4,10 +4,10 @@ from .. import setup, tools
 from .. import observer
 from ..components import person
 from .. import constants as c
-import googletrans#구글 번역 API
+from .. import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 #Python 2/3 compatibility.
 if sys.version_info[0] == 2:
@@ -76,11 +76,11 @@ class DeathScene(tools._State):
     def startup(self, current_time, game_data):
         #사망 시 장면이 나올 때 데이터를 초기화한다.
         self.game_data = game_data
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.get_font(c.MAIN_FONT, 22)
         self.background = pg.Surface(setup.SCREEN_RECT.size)
         self.background.fill(c.BLACK_BLUE)
         self.player = person.Player('down', self.game_data, 1, 1, 'resting', 1)
-        self.player.image = pg.transform.scale2x(self.player.image)
+        self.player.image = self.player.scaled_animation_dict[self.player.direction][self.player.index]
         self.player.rect = self.player.image.get_rect()
         self.player.rect.center = setup.SCREEN_RECT.center
         self.message_box = self.make_message_box()
@@ -89,14 +89,18 @@ class DeathScene(tools._State):
         self.state = c.TRANSITION_IN
         self.alpha = 255
         self.name = c.DEATH_SCENE
-        self.transition_surface = pg.Surface(setup.SCREEN_RECT.size)
-        self.transition_surface.fill(c.BLACK_BLUE)
-        self.transition_surface.set_alpha(self.alpha)
         if not os.path.isfile("save.p"):
             game_data = tools.create_game_data_dict()
             pickle.dump(game_data, open("save.p", "wb"))
         self.observers = [observer.SoundEffects()]
 
+    def translation_strings(self):
+        """
+        Return the text of the death message box.
+        사망 시 메시지 박스에 표시할 문자열 목록을 반환한다.
+        """
+        return translation.module_literals(sys.modules[__name__])
+
     def notify(self, event):
         """
         Notify all observers of event.
@@ -113,16 +117,16 @@ class DeathScene(tools._State):
         box_image = setup.GFX['dialoguebox']
         box_rect = box_image.get_rect()
         text = translator.translate('You have died. Restart from last save point?', dest='ko').text
-        text_render = self.font.render(text, True, c.NEAR_BLACK) 
+        text_render = tools.render_text(self.font, text, True, c.NEAR_BLACK) 
         text_rect = text_render.get_rect(centerx=box_rect.centerx,
                                          y=30)
         text2 = translator.translate('Yes', dest='ko').text
-        text2_render = self.font.render(text2, True, c.NEAR_BLACK)
+        text2_render = tools.render_text(self.font, text2, True, c.NEAR_BLACK)
         text2_rect = text2_render.get_rect(centerx=box_rect.centerx,
                                            y=70)
 
         text3 = translator.translate('No', dest='ko').text
-        text3_render = self.font.render(text3, True, c.NEAR_BLACK)
+        text3_render = tools.render_text(self.font, text3, True, c.NEAR_BLACK)
         text3_rect = text3_render.get_rect(centerx=box_rect.centerx,
                                            y=105)
 
@@ -155,16 +159,24 @@ class DeathScene(tools._State):
         Update scene.
         장면을 업데이트한다.
         """
+        self.dirty = None if self.state != c.NORMAL else []
         update_level = self.state_dict[self.state]
         update_level(keys)
-        self.draw_level(surface)
+        if self.dirty is None or self.dirty:
+            self.draw_level(surface)
+
+    def dirty_rects(self):
+        """
+        Return the screen rects changed by the last update.
+        마지막 업데이트에서 바뀐 화면 영역을 반환한다. 페이드 중에는 화면 전체(None)이다.
+        """
+        return self.dirty
 
     def transition_in(self, *args):
         """
         Transition into scene with a fade.
         페이드인 효과를 준다.
         """
-        self.transition_surface.set_alpha(self.alpha)
         self.alpha -= c.TRANSITION_SPEED
         if self.alpha <= 0:
             self.alpha = 0
@@ -175,15 +187,17 @@ class DeathScene(tools._State):
         Transition out of scene with a fade.
         페이드아웃 효과를 준다.
         """
-        self.transition_surface.set_alpha(self.alpha)
         self.alpha += c.TRANSITION_SPEED
         if self.alpha >= 255:
             self.done = True
 
     def normal_update(self, keys):
         #업데이트 해야할 항목들을 업데이트시킨다.
+        old_rect = self.arrow.rect.copy()
         self.arrow.update(keys)
         self.check_for_input(keys)
+        if self.arrow.rect != old_rect:
+            self.dirty = [old_rect, self.arrow.rect.copy()]
 
     def check_for_input(self, keys):
         """
@@ -209,7 +223,7 @@ class DeathScene(tools._State):
         surface.blit(self.player.image, self.player.rect)
         surface.blit(self.message_box.image, self.message_box.rect)
         surface.blit(self.arrow.image, self.arrow.rect)
-        surface.blit(self.transition_surface, (0, 0))
+        tools.draw_fade(surface, self.alpha)
 
 
 
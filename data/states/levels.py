@@ -5,18 +5,19 @@ differentiated by self.name and self.tmx_map.
 This class inherits from the generic state class
 found in the tools.py module.
 """
-import copy, sys
+import collections, copy, sys
+from xml.etree import ElementTree
 import pygame as pg
-from .. import tools, collision
+from .. import tools, collision, menugui
 from .. import constants as c
 from .. components import person, textbox, portal
 from . import player_menu
 from .. import tilerender
 from .. import setup
-import googletrans#구글 번역 API
+from .. import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 
 #Python 2/3 compatibility.
@@ -36,6 +37,7 @@ class LevelState(tools._State):
         self.music = None
         self.volume = None
         self.portal = None
+        self.suspendable = True
 
     def startup(self, current_time, game_data):
         """
@@ -46,21 +48,28 @@ class LevelState(tools._State):
         self.music, self.volume = self.set_music()
         self.current_time = current_time
         self.state = 'transition_in'
+        self.drawn_state = None
         self.reset_dialogue = ()
         self.switch_to_battle = False
         self.use_portal = False
         self.allow_input = False
         self.cut_off_bottom_map = ['castle', 'town', 'dungeon']
-        self.renderer = tilerender.Renderer(self.tmx_map)
-        self.map_image = self.renderer.make_2x_map()
+        self.renderer, self.map_image = tilerender.load_map(self.tmx_map)
 
         self.viewport = self.make_viewport(self.map_image)
+        self.cull_rect = self.viewport.inflate(c.CULL_MARGIN*2, c.CULL_MARGIN*2)
+        self.sprite_tick = 0
         self.level_surface = self.make_level_surface(self.map_image)
         self.level_rect = self.level_surface.get_rect()
+        self.load_counts = collections.Counter()
         self.portals = self.make_level_portals()
         self.player = self.make_player()
         self.blockers = self.make_blockers()
         self.sprites = self.make_sprites()
+        self.load_counts['portals'] = len(self.portals)
+        self.load_counts['blockers'] = len(self.blockers)
+        self.load_counts['player'] = 1
+        self.report_load_counts()
 
         self.collision_handler = collision.CollisionHandler(self.player,
                                                             self.blockers,
@@ -70,9 +79,63 @@ class LevelState(tools._State):
         self.dialogue_handler = textbox.TextHandler(self)
         self.state_dict = self.make_state_dict()
         self.menu_screen = player_menu.Player_Menu(game_data, self)
-        self.transition_rect = setup.SCREEN.get_rect()
         self.transition_alpha = 255
 
+    def resume(self, current_time, game_data):
+        """
+        Return from a battle or shop.  The map, sprites, NPC positions and
+        handlers are kept; only the player is placed again and whatever
+        the overlay may have changed in game_data is checked.
+        전투나 상점에서 돌아올 때 호출한다. 지역을 새로 만들지 않고 플레이어 위치만 다시 정한다.
+        """
+        if game_data is not self.game_data:
+            self.startup(current_time, game_data)
+            return
+
+        self.music, self.volume = self.set_music()
+        self.current_time = current_time
+        self.state = 'transition_in'
+        self.drawn_state = None
+        self.switch_to_battle = False
+        self.use_portal = False
+        self.allow_input = False
+        self.player = self.make_player()
+        self.collision_handler.player = self.player
+        self.dialogue_handler.player = self.player
+        if self.game_data['crown quest']:
+            for sprite in self.sprites:
+                if sprite.name == 'evilwizard':
+                    sprite.kill()
+        self.transition_alpha = 255
+
+    def report_load_counts(self):
+        """
+        Print how many objects of each kind this startup created, if
+        REPORT_LEVEL_LOADS is set.
+        이번 startup에서 만든 객체 수를 종류별로 출력한다.
+        """
+        if c.REPORT_LEVEL_LOADS:
+            counts = ', '.join('{} {}'.format(count, kind) for kind, count
+                               in sorted(self.load_counts.items()))
+            print('{}: {} objects ({})'.format(self.name,
+                                               sum(self.load_counts.values()),
+                                               counts))
+
+    def translation_strings(self):
+        """
+        Return the map dialogue and the GUI text this level translates.
+        The TMX file is read as plain XML, without loading any tiles.
+        지역의 대화 내용과 화면 문자열 목록을 반환한다.
+        """
+        strings = translation.module_literals(sys.modules[__name__],
+                                              textbox, menugui)
+        for map_property in ElementTree.parse(self.tmx_map).iter('property'):
+            name = map_property.get('name')
+            if name.startswith('dialogue') and name != 'dialogue length':
+                strings.add(map_property.get('value'))
+
+        return strings
+
     def set_music(self):
         """
         Set music based on name.
@@ -171,7 +234,7 @@ class LevelState(tools._State):
         Make any sprites for the level as needed.
         각 지역에 필요한 스프라이트들을 만든다
         """
-        sprites = pg.sprite.Group()
+        sprites = collision.SpriteGroup()
 
         for object in self.renderer.tmx_data.getObjects():
             properties = object.__dict__
@@ -206,32 +269,22 @@ class LevelState(tools._State):
                 else:
                     sprite_state = None
 
+                if 'wander' in properties:
+                    wander = int(properties['wander'])
+                else:
+                    wander = None
+
 
                 x = properties['x'] * 2
                 y = ((properties['y']) * 2) - 32
 
-                sprite_dict = {'oldman': person.Person('oldman',
-                                                       x, y, direction),
-                               'bluedressgirl': person.Person('femalevillager',
-                                                              x, y, direction,
-                                                              'resting', 1),
-                               'femalewarrior': person.Person('femvillager2',
-                                                              x, y, direction,
-                                                              'autoresting'),
-                               'devil': person.Person('devil', x, y,
-                                                      'down', 'autoresting'),
-                               'oldmanbrother': person.Person('oldmanbrother',
-                                                              x, y, direction),
-                               'soldier': person.Person('soldier',
-                                                        x, y, direction,
-                                                        'resting', index),
-                               'king': person.Person('king', x, y, direction),
-                               'evilwizard': person.Person('evilwizard', x, y, direction),
-                               'treasurechest': person.Chest(x, y, id)}
-
-                sprite = sprite_dict[properties['type']]
+                sprite = person.make_sprite(properties['type'], x, y,
+                                            direction, index, id)
+                self.load_counts[properties['type']] += 1
                 if sprite_state:
                     sprite.state = sprite_state
+                if wander is not None:
+                    sprite.wander_box = sprite.make_wander_box(wander)
 
                 if sprite.name == 'oldman':
                     if self.game_data['old man gift'] and not self.game_data['elixir received']:
@@ -290,7 +343,7 @@ class LevelState(tools._State):
                                        translator.translate('You have a wise and generous spirit.', dest='ko').text]
                 else:
                     sprite.dialogue = [translator.translate('Hurry! There is precious little time.', dest='ko').text]
-            elif self.game_data[translator.translate('talked to sick brother', dest='ko').text]:
+            elif self.game_data['talked to sick brother']:
                 sprite.dialogue = [translator.translate('My brother is sick?!?', dest='ko').text,
                                    translator.translate('I have not seen him in years.  I had no idea he was not well.', dest='ko').text,
                                    translator.translate('Quick, take this ELIXIR to him immediately.', dest='ko').text]
@@ -357,7 +410,7 @@ class LevelState(tools._State):
         """
         self.check_for_dialogue()
         self.player.update(keys, current_time)
-        self.sprites.update(current_time)
+        self.update_sprites(current_time)
         self.collision_handler.update(keys, current_time)
         self.check_for_battle()
         self.check_for_portals()
@@ -367,6 +420,25 @@ class LevelState(tools._State):
         self.viewport_update()
         self.draw_level(surface)
 
+    def update_sprites(self, current_time):
+        """
+        Update the sprites near the viewport every frame.  Sprites farther
+        away run their AI and animation once every
+        c.OFFSCREEN_UPDATE_INTERVAL frames, staggered so they do not all
+        land on the same frame; their blockers still follow them every frame.
+        화면 근처의 스프라이트는 매 프레임, 멀리 있는 스프라이트는 몇 프레임에 한 번씩 나누어 업데이트한다.
+        """
+        interval = c.OFFSCREEN_UPDATE_INTERVAL
+        self.sprite_tick = (self.sprite_tick + 1) % interval
+        cull_rect = self.cull_rect
+
+        for i, sprite in enumerate(self.sprites):
+            if (cull_rect.colliderect(sprite.rect) or
+                    (i + self.sprite_tick) % interval == 0):
+                sprite.update(current_time)
+            else:
+                sprite.set_blockers()
+
     def check_for_portals(self):
         """
         Check if the player walks into a door, requiring a level change.
@@ -471,11 +543,8 @@ class LevelState(tools._State):
         Transition level to new scene.
          페이드 아웃 효과
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
         self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
+        tools.draw_fade(surface, self.transition_alpha)
         self.transition_alpha += c.TRANSITION_SPEED
         if self.transition_alpha >= 255:
             self.transition_alpha = 255
@@ -486,11 +555,8 @@ class LevelState(tools._State):
         Transition level to new scene.
         느린 페이드 효과
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
         self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
+        tools.draw_fade(surface, self.transition_alpha)
         self.transition_alpha += 2
         if self.transition_alpha >= 255:
             self.transition_alpha = 255
@@ -502,11 +568,8 @@ class LevelState(tools._State):
         페이드 인 효과
         """
         self.viewport_update()
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
         self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
+        tools.draw_fade(surface, self.transition_alpha)
         self.transition_alpha -= c.TRANSITION_SPEED 
         if self.transition_alpha <= 0:
             self.state = 'normal'
@@ -517,9 +580,21 @@ class LevelState(tools._State):
         Update state.
         스테이지를 업데이트한다.
         """
+        self.state_changed = self.state != self.drawn_state
+        self.drawn_state = self.state
         state_function = self.state_dict[self.state]
         state_function(surface, keys, current_time)
 
+    def dirty_rects(self):
+        """
+        Return the screen rects changed by the last update.  Only the
+        player menu is static enough to report less than the whole screen.
+        마지막 업데이트에서 바뀐 화면 영역을 반환한다. 메뉴 화면일 때만 일부 영역을 반환한다.
+        """
+        if self.drawn_state == 'menu' and not self.state_changed:
+            return self.menu_screen.dirty_rects()
+        return None
+
     def viewport_update(self):
         """
         Update viewport so it stays centered on character,
@@ -528,6 +603,7 @@ class LevelState(tools._State):
         """
         self.viewport.center = self.player.rect.center
         self.viewport.clamp_ip(self.level_rect)
+        self.cull_rect.center = self.viewport.center
 
     def draw_level(self, surface):
         """
@@ -536,7 +612,10 @@ class LevelState(tools._State):
         """
         self.level_surface.blit(self.map_image, self.viewport, self.viewport)
         self.level_surface.blit(self.player.image, self.player.rect)
-        self.sprites.draw(self.level_surface)
+        #화면(viewport) 밖의 스프라이트는 그리지 않는다.
+        for sprite in self.sprites:
+            if self.viewport.colliderect(sprite.rect):
+                self.level_surface.blit(sprite.image, sprite.rect)
 
         surface.blit(self.level_surface, (0, 0), self.viewport)
         self.dialogue_handler.draw(surface)
@@ -27,8 +27,7 @@ class Menu(tools._State):
     
     #그래픽적 요소들(map_image, map_rect, viewport)을 초기화한다
     def startup(self, *args):
-        self.renderer = tilerender.Renderer(self.tmx_map)
-        self.map_image = self.renderer.make_2x_map()
+        self.renderer, self.map_image = tilerender.load_map(self.tmx_map)
         self.map_rect = self.map_image.get_rect()
         self.viewport = self.make_viewport(self.map_image)
         self.level_surface = pg.Surface(self.map_rect.size)
@@ -39,9 +38,6 @@ class Menu(tools._State):
         self.state_dict = self.make_state_dict()
         self.state = c.TRANSITION_IN
         self.alpha = 255
-        self.transition_surface = pg.Surface(setup.SCREEN_RECT.size)
-        self.transition_surface.fill(c.BLACK_BLUE)
-        self.transition_surface.set_alpha(self.alpha)
 
     #level을 볼 수 있는 뷰포트를 생성한다.
     def make_viewport(self, map_image):
@@ -63,11 +59,18 @@ class Menu(tools._State):
     #scene을 update한다
     def update(self, surface, *args):
         """
-        Update scene.
+        Update scene.  Once the fade in is over the scene is static,
+        so it is only drawn while fading.
         """
+        self.dirty = None if self.state != c.NORMAL else []
         update_level = self.state_dict[self.state]
         update_level()
-        self.draw_level(surface)
+        if self.dirty is None:
+            self.draw_level(surface)
+
+    #마지막 update에서 바뀐 화면 영역을 반환한다
+    def dirty_rects(self):
+        return self.dirty
         
     #tmx 맵과 title box를 화면에 표시합니다
     def draw_level(self, surface):
@@ -77,7 +80,7 @@ class Menu(tools._State):
         self.level_surface.blit(self.map_image, self.viewport, self.viewport)
         self.level_surface.blit(self.title_box, self.title_rect)
         surface.blit(self.level_surface, (0,0), self.viewport)
-        surface.blit(self.transition_surface, (0,0))
+        tools.draw_fade(surface, self.alpha)
         
     #이벤트를 받는다
     def get_event(self, event):
@@ -89,7 +92,6 @@ class Menu(tools._State):
         """
         Transition into scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
         self.alpha -= c.TRANSITION_SPEED
         if self.alpha <= 0:
             self.alpha = 0
@@ -100,7 +102,6 @@ class Menu(tools._State):
         """
         Transition out of scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
         self.alpha += c.TRANSITION_SPEED
         if self.alpha >= 255:
             self.done = True
@@ -124,8 +125,7 @@ class Instructions(tools._State):
         
     #그래픽적 요소들(map_image, map_rect, viewport)을 초기화한다
     def startup(self, *args):
-        self.renderer = tilerender.Renderer(self.tmx_map)
-        self.map_image = self.renderer.make_2x_map()
+        self.renderer, self.map_image = tilerender.load_map(self.tmx_map)
         self.map_rect = self.map_image.get_rect()
         self.viewport = self.make_viewport(self.map_image)
         self.level_surface = pg.Surface(self.map_rect.size)
@@ -139,9 +139,6 @@ class Instructions(tools._State):
         self.name = c.MAIN_MENU
         self.state = c.TRANSITION_IN
         self.alpha = 255
-        self.transition_surface = pg.Surface(setup.SCREEN_RECT.size)
-        self.transition_surface.fill(c.BLACK_BLUE)
-        self.transition_surface.set_alpha(self.alpha)
         self.observers = [observer.SoundEffects()]
 
     #self.observers의 on_notify 함수에 event를 전달한다
@@ -192,11 +189,18 @@ class Instructions(tools._State):
     #scene을 update한다
     def update(self, surface, keys, *args):
         """
-        Update scene.
+        Update scene.  After the fade in only the regions reported in
+        self.dirty are redrawn.
         """
+        self.dirty = None if self.state != c.NORMAL else []
         update_level = self.state_dict[self.state]
         update_level(keys)
-        self.draw_level(surface)
+        if self.dirty is None or self.dirty:
+            self.draw_level(surface)
+
+    #마지막 update에서 바뀐 화면 영역을 반환한다
+    def dirty_rects(self):
+        return self.dirty
 
     #tmx 맵과 title box를 화면에 표시한다
     def draw_level(self, surface):
@@ -207,7 +211,7 @@ class Instructions(tools._State):
         self.level_surface.blit(self.title_box, self.title_rect)
         self.draw_arrow()
         surface.blit(self.level_surface, (0,0), self.viewport)
-        surface.blit(self.transition_surface, (0,0))
+        tools.draw_fade(surface, self.alpha)
 
     #껍데기 메소드(내용: pass)
     def draw_arrow(self):
@@ -223,7 +227,6 @@ class Instructions(tools._State):
         """
         Transition into scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
         self.alpha -= c.TRANSITION_SPEED
         if self.alpha <= 0:
             self.alpha = 0
@@ -234,7 +237,6 @@ class Instructions(tools._State):
         """
         Transition out of scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
         self.alpha += c.TRANSITION_SPEED
         if self.alpha >= 255:
             self.done = True
@@ -270,6 +272,7 @@ class LoadGame(Instructions):
     
     #키를 눌렀을 때 업데이트한다
     def normal_update(self, keys):
+        old_rect = self.arrow.rect.copy()
         if self.allow_input:
             if keys[pg.K_DOWN] and self.arrow.index == 0:
                 self.arrow.index = 1
@@ -294,6 +297,10 @@ class LoadGame(Instructions):
         if not keys[pg.K_DOWN] and not keys[pg.K_UP]:
             self.allow_input = True
 
+        if self.state == c.NORMAL and self.arrow.rect != old_rect:
+            offset = (-self.viewport.x, -self.viewport.y)
+            self.dirty = [old_rect.move(offset), self.arrow.rect.move(offset)]
+
         
 
 
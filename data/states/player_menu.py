@@ -61,6 +61,16 @@ class Player_Menu(object):
         self.gui.update(keys)
         self.draw(surface)
 
+    #마지막 update에서 메뉴의 내용이 바뀌었으면 화면 전체를, 아니면 빈 목록을 반환하는 메소드
+    def dirty_rects(self):
+        """
+        The menu covers the whole screen, so it is presented in full
+        when its contents change and not at all otherwise.
+        """
+        if self.gui.changed:
+            return [setup.SCREEN_RECT]
+        return []
+
     #새로 만든 gui를 surface에 blit하는 메소드
     def draw(self, surface):
         surface.blit(self.background.image, self.background.rect)
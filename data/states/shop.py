@@ -6,14 +6,14 @@ twice as big as a level state. The self.gui controls
 all the textboxes.
 """
 
-import copy
+import copy, sys
 import pygame as pg
 from .. import tools, setup, shopgui
 from .. import constants as c
-import googletrans#구글 번역 API
+from .. import translation
 
-#구글 번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 한글 문자열로 번역 가능
-translator = googletrans.Translator()
+#번역 변수 translator.translate(문장, dest='ko').text 함수를 사용해 오프라인 번역 카탈로그에서 한글 문자열을 가져온다
+translator = translation.translator
 
 #모든 상점 상태들의 부모 클래스가 되는 클래스
 #weapon 상점, armour상점, magic 상점, potion 상점의 부모 클래스(여관도 포함)
@@ -29,6 +29,7 @@ class Shop(tools._State):
         self.sell_items = None
         self.music = setup.MUSIC['shop_theme']
         self.volume = 0.4
+        self.overlay = True
 
     #상점 상태로 돌입할 때 셋업을 해주는 메소드
     def startup(self, current_time, game_data):
@@ -45,9 +46,15 @@ class Shop(tools._State):
         self.items = self.make_purchasable_items()
         self.background = self.make_background()
         self.gui = shopgui.Gui(self)
-        self.transition_rect = setup.SCREEN.get_rect()
         self.transition_alpha = 255
 
+    #상점에서 표시할 문자열 목록을 반환하는 메소드
+    def translation_strings(self):
+        """
+        Return the shop dialogue and GUI text.
+        """
+        return translation.module_literals(sys.modules[__name__], shopgui)
+
     #모든 상태에 대한 딕셔너리를 구현하는 메소드
     def make_state_dict(self):
         """
@@ -162,11 +169,8 @@ class Shop(tools._State):
         """
         Transition into level.
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
         self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
+        tools.draw_fade(surface, self.transition_alpha)
         self.transition_alpha -= c.TRANSITION_SPEED 
         if self.transition_alpha <= 0:
             self.state = 'normal'
@@ -177,11 +181,8 @@ class Shop(tools._State):
         """
         Transition level to new scene.
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
         self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
+        tools.draw_fade(surface, self.transition_alpha)
         self.transition_alpha += c.TRANSITION_SPEED 
         if self.transition_alpha >= 255:
             self.done = True
@@ -211,8 +212,9 @@ class Inn(Shop):
         """
         Make the list of dialogue phrases.
         """
-        return [translator.translate("Welcome to the " + self.name + "!",
-                "Would you like a room to restore your health?", dest='ko').text]
+        shop_name = translator.translate('Inn', dest='ko').text
+        return [translator.format("Welcome to the {}!", shop_name, dest='ko'),
+                translator.translate("Would you like a room to restore your health?", dest='ko').text]
 
     #player가 아이템을 구매(휴식)하면 출력하는 구문 반환하는 메소드
     def make_accept_dialogue(self):
@@ -249,9 +251,9 @@ class WeaponShop(Shop):
     #대화 구문 리스트를 구현하여 반환하는 메소드
     def make_dialogue(self):
         """Make the list of dialogue phrases"""
-        shop_name = translator.translate("{}{}".format(self.name[0].upper(), self.name[1:]), dest='ko').text
-        return [translator.translate("Welcome to the " + shop_name + "!",
-                "What weapon would you like to buy?", dest='ko').text]
+        shop_name = translator.translate('Weapon shop', dest='ko').text
+        return [translator.format("Welcome to the {}!", shop_name, dest='ko'),
+                translator.translate("What weapon would you like to buy?", dest='ko').text]
 
 
     #구매 가능한 아이템과 관련 정보를 딕셔너리로 구현하여 반환하는 메소드
@@ -291,9 +293,9 @@ class ArmorShop(Shop):
     #대화 구문을 반환하는 메소드
     def make_dialogue(self):
         """Make the list of dialogue phrases"""
-        shop_name = translator.translate("{}{}".format(self.name[0].upper(), self.name[1:]), dest='ko').text
-        return [translator.translate("Welcome to the " + shop_name + "!",
-                "Would piece of armor would you like to buy?", dest='ko').text]
+        shop_name = translator.translate('Armor shop', dest='ko').text
+        return [translator.format("Welcome to the {}!", shop_name, dest='ko'),
+                translator.translate("Would piece of armor would you like to buy?", dest='ko').text]
 
     #구매 가능한 아이템과 관련 정보를 딕셔너리로 구현하여 반환하는 메소드
     def make_purchasable_items(self):
@@ -329,9 +331,9 @@ class MagicShop(Shop):
     #대화 구문을 반환하는 메소드
     def make_dialogue(self):
         """Make the list of dialogue phrases"""
-        shop_name = translator.translate("{}{}".format(self.name[0].upper(), self.name[1:]), dest='ko').text
-        return [translator.translate("Welcome to the " + shop_name + "!",
-                "Would magic spell would you like to buy?", dest='ko').text]
+        shop_name = translator.translate('Magic shop', dest='ko').text
+        return [translator.format("Welcome to the {}!", shop_name, dest='ko'),
+                translator.translate("Would magic spell would you like to buy?", dest='ko').text]
 
     #구매 가능한 아이템과 관련 정보를 딕셔너리로 구현하여 반환하는 메소드
     def make_purchasable_items(self):
@@ -369,9 +371,9 @@ class PotionShop(Shop):
     #대화 구문을 반환하는 메소드
     def make_dialogue(self):
         """Make the list of dialogue phrases"""
-        shop_name = translator.translate("{}{}".format(self.name[0].upper(), self.name[1:]), dest='ko').text
-        return [translator.translate("Welcome to the " + shop_name + "!",
-                "What potion would you like to buy?", dest='ko').text]
+        shop_name = translator.translate('Potion shop', dest='ko').text
+        return [translator.format("Welcome to the {}!", shop_name, dest='ko'),
+                translator.translate("What potion would you like to buy?", dest='ko').text]
 
     #구매 가능한 아이템과 관련 정보를 딕셔너리로 구현하여 반환하는 메소드
     def make_purchasable_items(self):
@@ -5,8 +5,13 @@ This is a test of using the pytmx library with Tiled.
 # tilerender.py 파일 : pytmx(파이썬 기반 게임의 맵 로더)를 이용하여 사선 격자 형태의 월드맵을 구현하는 파일.
 
 # 모듈: pygame, pytmx
+import argparse, collections, hashlib, os, struct, time
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
 import pygame as pg
 from . import pytmx
+from . import tools
+from . import constants as c
 
 # Renderer(object) 클래스 : 사선 격자 형태의 월드맵을 구현하여 렌더링 하는 클래스.
 class Renderer(object):
@@ -14,9 +19,13 @@ class Renderer(object):
     This object renders tile maps from Tiled
     """
 
-    # init(self, filename) 메소드 : 객체 인스턴스(pygame 로드, 맵 사이즈) 생성
-    def __init__(self, filename):
-        tm = pytmx.load_pygame(filename, pixelalpha=True)
+    # init(self, filename, load_images) 메소드 : 객체 인스턴스(pygame 로드, 맵 사이즈) 생성
+    # load_images가 False이면 타일 이미지 없이 맵 데이터(오브젝트 등)만 읽는다
+    def __init__(self, filename, load_images=True):
+        if load_images:
+            tm = pytmx.load_pygame(filename, pixelalpha=True)
+        else:
+            tm = pytmx.load_tmx(filename)
         self.size = tm.width * tm.tilewidth, tm.height * tm.tileheight
         self.tmx_data = tm
 
@@ -50,4 +59,223 @@ class Renderer(object):
         temp_surface = pg.Surface(self.size)
         self.render(temp_surface)
         temp_surface = pg.transform.scale2x(temp_surface)
-        return temp_surface
\ No newline at end of file
+        return temp_surface
+
+# MapCache 클래스 : 파싱한 TiledMap과 2배 크기 맵 surface를 맵 파일별로 저장해두는 LRU 캐시
+class MapCache(object):
+    """
+    LRU cache of Renderers and their 2x map surfaces keyed on the TMX
+    filename.  The total size of the cached map surfaces is kept under
+    max_bytes by evicting the least recently visited maps; the map just
+    loaded is always kept.  Cached maps are shared, so blit them but
+    never draw on them.
+    """
+    def __init__(self, max_bytes=c.MAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.maps = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, filename):
+        """Return (renderer, map_image) for filename."""
+        entry = self.maps.get(filename)
+        if entry is not None:
+            self.hits += 1
+            self.maps.move_to_end(filename)
+            return entry
+
+        self.misses += 1
+        entry = load_baked_map(filename)
+        self.maps[filename] = entry
+        self.bytes += tools.surface_bytes(entry[1])
+        while self.bytes > self.max_bytes and len(self.maps) > 1:
+            _, (_, old_image) = self.maps.popitem(last=False)
+            self.bytes -= tools.surface_bytes(old_image)
+        return entry
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'maps': len(self.maps),
+                'bytes': self.bytes}
+
+
+# 맵 파일과 타일셋 파일의 내용으로 주소를 정하는 디스크 캐시 : 렌더링한 2배 크기 맵을 픽셀 버퍼 그대로 저장한다
+BAKE_DIR = 'map_cache'
+BAKE_VERSION = 1
+BAKE_FORMAT = 'RGB'
+BAKE_HEADER = struct.Struct('<4sII')
+BAKE_MAGIC = b'TSCM'
+
+
+# map_sources(filename) 메소드 : 맵 이미지를 결정하는 파일들(TMX, 외부 타일셋, 타일셋 이미지)의 경로를 반환하는 메소드
+def map_sources(filename):
+    """
+    Return the TMX file and every tileset file (TSX and image) it uses.
+    """
+    sources = [filename]
+    dirname = os.path.dirname(filename)
+    for tileset in ElementTree.parse(filename).getroot().findall('tileset'):
+        tileset_dir = dirname
+        source = tileset.get('source')
+        if source:
+            source = os.path.join(dirname, source)
+            sources.append(source)
+            tileset_dir = os.path.dirname(source)
+            tileset = ElementTree.parse(source).getroot()
+        image = tileset.find('image')
+        if image is not None:
+            sources.append(os.path.join(tileset_dir, image.get('source')))
+    return sources
+
+
+# map_key(filename) 메소드 : 맵을 만드는 파일들의 내용 해시로 디스크 캐시의 키를 만드는 메소드
+def map_key(filename):
+    """
+    Hash the contents of the TMX file and its tilesets, so a baked map is
+    found again only while none of them has changed.
+    """
+    digest = hashlib.sha1('{} {}'.format(BAKE_VERSION, BAKE_FORMAT).encode('ascii'))
+    for source in map_sources(filename):
+        with open(source, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# baked_path(key) 메소드 : 키에 해당하는 디스크 캐시 파일 경로를 반환하는 메소드
+def baked_path(key, directory=BAKE_DIR):
+    return os.path.join(directory, key + '.map')
+
+
+# read_baked_map(key) 메소드 : 디스크 캐시에서 맵 이미지를 한 번의 파일 읽기로 불러오는 메소드(없으면 None)
+def read_baked_map(key, directory=BAKE_DIR):
+    """
+    Load a baked map surface, or return None if it is missing or damaged.
+    """
+    try:
+        with open(baked_path(key, directory), 'rb') as f:
+            data = f.read()
+    except (IOError, OSError):
+        return None
+
+    if len(data) < BAKE_HEADER.size:
+        return None
+    magic, width, height = BAKE_HEADER.unpack_from(data)
+    pixels = memoryview(data)[BAKE_HEADER.size:]
+    if magic != BAKE_MAGIC or len(pixels) != width * height * len(BAKE_FORMAT):
+        return None
+    image = pg.image.frombuffer(pixels, (width, height), BAKE_FORMAT)
+    if pg.display.get_surface():
+        image = image.convert()
+    else:
+        image = image.copy()
+    return image
+
+
+# write_baked_map(key, image) 메소드 : 맵 이미지를 픽셀 버퍼 그대로 디스크 캐시에 저장하는 메소드
+def write_baked_map(key, image, directory=BAKE_DIR):
+    """
+    Store image under key.  The file is written under a temporary name and
+    renamed, so readers never see half a map.  Failure to write is ignored.
+    """
+    path = baked_path(key, directory)
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(temp_path, 'wb') as f:
+            f.write(BAKE_HEADER.pack(BAKE_MAGIC, image.get_width(), image.get_height()))
+            f.write(pg.image.tostring(image, BAKE_FORMAT))
+        os.replace(temp_path, path)
+    except (IOError, OSError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+# load_baked_map(filename) 메소드 : 디스크 캐시에 맵 이미지가 있으면 불러오고, 없으면 렌더링한 뒤 저장하는 메소드
+def load_baked_map(filename, directory=BAKE_DIR):
+    """
+    Return (renderer, map_image) for filename.  A baked map skips loading
+    the tileset images and rendering; the renderer then only holds the
+    map data.
+    """
+    key = map_key(filename)
+    map_image = read_baked_map(key, directory)
+    if map_image is not None:
+        return Renderer(filename, load_images=False), map_image
+
+    renderer = Renderer(filename)
+    map_image = renderer.make_2x_map()
+    write_baked_map(key, map_image, directory)
+    return renderer, map_image
+
+
+MAP_CACHE = MapCache()
+
+
+# load_map(filename) 메소드 : 공유 맵 캐시에서 (renderer, 2배 크기 맵 이미지)를 가져오는 메소드
+def load_map(filename):
+    """
+    Return (renderer, map_image) for a TMX file through the shared
+    MAP_CACHE.  map_image is shared with every other caller.
+    """
+    return MAP_CACHE.load(filename)
+
+
+# bake_map(filename, directory, force) 메소드 : 별도 프로세스에서 맵 하나를 렌더링해 디스크 캐시에 저장하는 메소드
+def bake_map(filename, directory=BAKE_DIR, force=False):
+    """
+    Render filename and store it in the bake directory.  Runs in a pool
+    worker, so it opens a hidden display for the tileset conversions.
+    Returns (filename, key, seconds, baked).
+    """
+    start = time.time()
+    key = map_key(filename)
+    if not force and os.path.isfile(baked_path(key, directory)):
+        return filename, key, time.time() - start, False
+
+    if not pg.display.get_surface():
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pg.display.init()
+        pg.display.set_mode((1, 1), 0, 32)
+    map_image = Renderer(filename).make_2x_map()
+    baked = write_baked_map(key, map_image, directory)
+    return filename, key, time.time() - start, baked
+
+
+# bake_all(tmx_dir, directory, workers, force) 메소드 : tmx 폴더의 모든 맵을 프로세스 풀에서 미리 렌더링하는 메소드
+def bake_all(tmx_dir=os.path.join('resources', 'tmx'), directory=BAKE_DIR,
+             workers=None, force=False):
+    """Bake every TMX file in tmx_dir across a process pool."""
+    filenames = sorted(os.path.join(tmx_dir, name) for name in os.listdir(tmx_dir)
+                       if name.lower().endswith('.tmx'))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(bake_map, filenames,
+                             [directory] * len(filenames),
+                             [force] * len(filenames)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-render the TMX maps into the map cache.')
+    parser.add_argument('--tmx-dir', default=os.path.join('resources', 'tmx'))
+    parser.add_argument('--out', default=BAKE_DIR,
+                        help='map cache directory (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='render maps that are already baked again')
+    args = parser.parse_args()
+
+    start = time.time()
+    results = bake_all(args.tmx_dir, args.out, args.workers, args.force)
+    for filename, key, seconds, baked in results:
+        print('{} {} {} ({:.2f}s)'.format('baked  ' if baked else 'cached ',
+                                          key[:12], filename, seconds))
+    print('{} maps in {:.2f}s'.format(len(results), time.time() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,10 @@
 __author__ = 'justinarmstrong'
 
 # tools.py 파일 : 게임 프로그램의 전반적인 설정과 상태(States)를 세팅하는 파일.
-import os, random
+import collections, os, random
 import pygame as pg
 from . import constants as c
+from . import translation
 
 # Control(object) 클래스 : 게임의 전체적인 작동 방식(루프, 이벤트 발생, 상태 변환)들을 제어하는 클래스
 class Control(object):
@@ -27,12 +28,16 @@ class Control(object):
         self.state_dict = {}
         self.state_name = None
         self.state = None
+        self.prefetched = None
+        self.full_update = True
+        self.state_stack = []
 
     # setup_states(self, state_dict, start_state) 메소드 : 게임의 상태와 음악을 초기 설정하는 메소드
     def setup_states(self, state_dict, start_state):
         self.state_dict = state_dict
         self.state_name = start_state
         self.state = self.state_dict[self.state_name]
+        self.prefetch(self.state_name)
         self.set_music()
 
     # update(self) 메소드 : 실시간 시간 흐름, 게임 내 상태를 설정하는 메소드
@@ -42,17 +47,46 @@ class Control(object):
             self.done = True
         elif self.state.done:
             self.flip_state()
+        elif self.state.next != self.prefetched:
+            self.prefetch(self.state.next)
         self.state.update(self.screen, self.keys, self.current_time)
 
+    # prefetch(self, state_name) 메소드 : 다음 상태가 사용할 번역 문자열을 현재 상태의 페이드 아웃 동안 미리 번역하는 메소드
+    def prefetch(self, state_name):
+        """
+        Start translating the strings the named state needs on the
+        background workers, so its startup finds them cached.
+        """
+        self.prefetched = state_name
+        if state_name in self.state_dict:
+            translation.prefetch(self.state_dict[state_name].translation_strings)
+
     # flip_state(self) 메소드 : 게임 내에서 이전 창으로 돌아갔을 때 게임 내 설정을 이전 버전으로 되돌리는 메소드
+    # 전투, 상점 같은 overlay 상태로 갈 때는 지역 상태를 없애지 않고 state_stack에 쌓아 두었다가(push),
+    # overlay 상태가 그 지역으로 돌아오면 startup 대신 resume으로 그대로 되살린다(pop)
     def flip_state(self):
         previous, self.state_name = self.state_name, self.state.next
         previous_music = self.state.music_title
-        persist = self.state.cleanup()
-        self.state = self.state_dict[self.state_name]
+        next_state = self.state_dict[self.state_name]
+        resume = False
+        if next_state.overlay and self.state.suspendable:
+            persist = self.state.suspend()
+            self.state_stack.append(previous)
+        else:
+            persist = self.state.cleanup()
+            if self.state_stack and self.state_stack[-1] == self.state_name:
+                self.state_stack.pop()
+                resume = True
+            else:
+                self.state_stack = []
+        self.state = next_state
         self.state.previous = previous
         self.state.previous_music = previous_music
-        self.state.startup(self.current_time, persist)
+        if resume:
+            self.state.resume(self.current_time, persist)
+        else:
+            self.state.startup(self.current_time, persist)
+        self.full_update = True
         self.set_music()
 
     # set_music(self) 메소드 : 다음 창으로 넘어갔을 때 음악을 새로 로드하는 메소드
@@ -81,6 +115,8 @@ class Control(object):
             elif event.type == pg.KEYUP:
                 self.keys = pg.key.get_pressed()
                 self.state.get_event(event)
+            elif event.type in (pg.VIDEOEXPOSE, pg.ACTIVEEVENT):
+                self.full_update = True
 
     # toggle_show_fps(self, key) 메소드 : 게임의 프레임을 화면에 보여주는 메소드
     def toggle_show_fps(self, key):
@@ -92,16 +128,34 @@ class Control(object):
     # main(self) 메소드 : Control 클래스의 메소드들을 총 제어하고 실행하는 메소드
     def main(self):
         """Main loop for entire program"""
+        #setup은 tools를 import하므로 순환 import를 피해 게임 루프가 시작될 때 가져온다.
+        from . import setup
         while not self.done:
             self.event_loop()
             self.update()
-            pg.display.update()
+            self.update_display()
             self.clock.tick(self.fps)
             if self.show_fps:
                 fps = self.clock.get_fps()
-                with_fps = "{} - {:.2f} FPS".format(self.caption, fps)
+                text_hit_rate = TEXT_CACHE.stats()['hit rate']
+                with_fps = "{} - {:.2f} FPS - text cache {:.0%} - {} fonts".format(
+                    self.caption, fps, text_hit_rate, setup.font_count())
                 pg.display.set_caption(with_fps)
 
+    # update_display(self) 메소드 : 상태가 바뀐 영역만 화면에 반영하고, 상태 전환 후에는 화면 전체를 반영하는 메소드
+    def update_display(self):
+        """
+        Present only the rects the state reports as changed.  The whole
+        screen is presented after a state flip, after the window is
+        exposed, or when the state reports None.
+        """
+        rects = self.state.dirty_rects()
+        if self.full_update or rects is None:
+            pg.display.update()
+        elif rects:
+            pg.display.update(rects)
+        self.full_update = False
+
 # _State(object) 클래스 : 게임 전체의 설정과 상태를 지정하는 클래스
 class _State(object):
     """Base class for all game states"""
@@ -117,6 +171,8 @@ class _State(object):
         self.music = None
         self.music_title = None
         self.previous_music = None
+        self.overlay = False
+        self.suspendable = False
 
     def get_event(self, event):
         pass
@@ -126,11 +182,44 @@ class _State(object):
         self.game_data = game_data
         self.start_time = current_time
 
+    # translation_strings(self) 메소드 : 상태가 시작할 때 번역하는 문자열 목록을 반환하는 메소드
+    def translation_strings(self):
+        """
+        Return the strings this state translates while starting up.
+        Called on a translation worker thread, so it must not touch pygame.
+        """
+        return []
+
+    # dirty_rects(self) 메소드 : 마지막 update에서 바뀐 화면 영역의 목록을 반환하는 메소드(None이면 화면 전체)
+    def dirty_rects(self):
+        """
+        Return the list of screen rects changed by the last update, or
+        None if the whole screen needs presenting.
+        """
+        return None
+
     # cleanup(self) 메소드 : 게임 데이터를 반환하는 메소드
     def cleanup(self):
         self.done = False
         return self.game_data
 
+    # suspend(self) 메소드 : overlay 상태로 넘어갈 때 상태를 없애지 않고 멈춰두며 게임 데이터를 반환하는 메소드
+    def suspend(self):
+        """
+        Called instead of cleanup when an overlay state is pushed on top
+        of a suspendable state.
+        """
+        self.done = False
+        return self.game_data
+
+    # resume(self, current_time, game_data) 메소드 : overlay 상태에서 돌아올 때 멈춰둔 상태를 다시 시작하는 메소드
+    def resume(self, current_time, game_data):
+        """
+        Called instead of startup when the overlay on top of a suspended
+        state returns to it.  States that keep nothing start up again.
+        """
+        self.startup(current_time, game_data)
+
     def update(self, surface, keys, current_time):
         pass
 
@@ -186,6 +275,123 @@ def get_image(x, y, width, height, sprite_sheet):
 
     return image
 
+# TextCache 클래스 : 한 번 렌더링한 텍스트 surface를 (폰트, 문자열, 색상) 키로 저장해두고 재사용하는 LRU 캐시
+class TextCache(object):
+    """
+    LRU cache of rendered text surfaces keyed on (font, text, antialias,
+    color).  The total size of the cached surfaces is kept under max_bytes
+    by evicting the least recently used entries.
+    """
+    def __init__(self, max_bytes=c.TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.surfaces = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.bytes += surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            old_key, old_surface = self.surfaces.popitem(last=False)
+            self.bytes -= surface_bytes(old_surface)
+
+        return surface
+
+    def stats(self):
+        """Return hit/miss counters and the current memory use."""
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit rate': float(self.hits) / lookups if lookups else 0.0,
+                'surfaces': len(self.surfaces),
+                'bytes': self.bytes}
+
+
+# surface_bytes(surface) 메소드 : surface가 차지하는 픽셀 메모리 크기를 반환하는 메소드
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+TEXT_CACHE = TextCache()
+
+
+# render_text(font, text, antialias, color) 메소드 : 공유 텍스트 캐시를 통해 font.render를 대신하는 메소드
+def render_text(font, text, antialias, color):
+    """
+    Render text through the shared TEXT_CACHE.  The returned surface is
+    shared with every other caller: blit it, never draw on it.
+    """
+    return TEXT_CACHE.render(font, text, antialias, color)
+
+SCALED_FRAMES = {}
+
+
+# get_scaled_frames(key, make_frames) 메소드 : 2배 크기 프레임을 key별로 한 번만 만들어 모든 호출자가 공유하게 하는 메소드
+def get_scaled_frames(key, make_frames):
+    """
+    Return the frames from make_frames() scaled 2x.  make_frames is only
+    called the first time key is asked for; the scaled frames (a dict or
+    a list, like the frames given) are then shared by every caller, so
+    treat them as read-only.
+    """
+    scaled = SCALED_FRAMES.get(key)
+    if scaled is None:
+        frames = make_frames()
+        if isinstance(frames, dict):
+            scaled = dict((name, pg.transform.scale2x(frame))
+                          for name, frame in frames.items())
+        else:
+            scaled = [pg.transform.scale2x(frame) for frame in frames]
+        SCALED_FRAMES[key] = scaled
+    return scaled
+
+# TransitionOverlay 클래스 : 페이드 효과에 쓰는 화면 크기의 surface를 한 번만 만들고 알파값만 바꿔가며 재사용하는 클래스
+class TransitionOverlay(object):
+    """
+    Full screen fade overlay shared by every state.  The surface is made
+    once, in display format and filled with color; a fade only changes
+    its alpha before blitting, so no surface is allocated per frame.
+    """
+    def __init__(self, color=c.TRANSITION_COLOR, size=c.SCREEN_SIZE):
+        self.color = color
+        self.size = size
+        self.surface = None
+
+    def get_surface(self):
+        """Make the overlay on first use, once the display exists."""
+        if self.surface is None:
+            self.surface = pg.Surface(self.size).convert()
+            self.surface.fill(self.color)
+        return self.surface
+
+    def draw(self, surface, alpha):
+        """Blit the overlay at alpha (clamped to 0-255) onto surface."""
+        alpha = max(0, min(255, int(alpha)))
+        if alpha:
+            overlay = self.get_surface()
+            overlay.set_alpha(alpha)
+            surface.blit(overlay, (0, 0))
+
+
+TRANSITION_OVERLAY = TransitionOverlay()
+
+
+# draw_fade(surface, alpha) 메소드 : 공유 페이드 surface를 알파값 alpha로 화면에 그리는 메소드
+def draw_fade(surface, alpha):
+    """Draw the shared TRANSITION_OVERLAY onto surface at alpha."""
+    TRANSITION_OVERLAY.draw(surface, alpha)
+
 # get_tile(x, y, tileset, width=16, height=16, scale=1) 메소드 : 맵의 면적을 계산하여 반환하는 메소드
 def get_tile(x, y, tileset, width=16, height=16, scale=1):
     """Gets the surface and rect for a tile"""
@@ -0,0 +1,603 @@
+"""
+Offline translation catalog.
+
+Every translatable literal in the game is extracted ahead of time into a
+versioned catalog under resources/translations.  At runtime the catalog is
+loaded once into a dict and every lookup is served from memory, so the game
+loop never waits on the network.
+
+Build or refresh a catalog with:
+
+    python -m data.translation --dest ko
+
+Messages that carry numbers are written as templates, e.g.
+translator.format('You found {} gold.', gold, dest='ko').  Only the
+template is catalogued; the values are substituted locally, so the number
+of distinct translations does not grow with the values shown.
+
+Text that is not in the catalog (map dialogue, strings added since the last
+build) goes through translate_async(text): it returns the source text at
+once and fetches the translation on a background thread, and GUI code that
+redraws every frame picks the result up on its next redraw.  Fetched
+translations are kept in a TranslationCache: a bounded in-memory LRU in
+front of a sqlite file, so a phrase is fetched once and never again in
+later sessions.  The sqlite file is only read and written on the worker
+threads.
+
+States declare the strings they need through translation_strings(), and
+tools.Control hands them to prefetch() as soon as it knows which state
+comes next, so misses are fetched while the current state is fading out.
+
+Misses are coalesced into batches of up to BATCH_SIZE strings per request.
+Set TRANSLATION_SERVER_URL to send them to a batch translation server (see
+data/translation_server.py for a local stand-in); otherwise googletrans is
+used when it is installed.
+"""
+
+# translation.py 파일 : 번역 카탈로그를 미리 만들어두고 게임 실행 중에는 메모리에서만 번역을 찾는다.
+
+import argparse
+import ast
+import io
+import json
+import collections
+import logging
+import os
+import queue
+import sqlite3
+import string
+import threading
+import time
+import urllib.request
+
+CATALOG_VERSION = 1
+DEFAULT_DEST = 'ko'
+CATALOG_DIR = os.path.join('resources', 'translations')
+ASYNC_WORKERS = 2
+BATCH_SIZE = 32
+BATCH_DELAY = 0.01
+BATCH_TIMEOUT = 10
+TRANSLATION_SERVER_URL = os.environ.get('TRANSLATION_SERVER_URL')
+CACHE_PATH = 'translation_cache.db'
+CACHE_CAPACITY = 512
+ABSENT_CAPACITY = 4096
+
+log = logging.getLogger(__name__)
+
+# 번역할 문자열을 추출할 모듈 목록
+SOURCE_MODULES = [os.path.join('data', 'battlegui.py'),
+                  os.path.join('data', 'menugui.py'),
+                  os.path.join('data', 'shopgui.py'),
+                  os.path.join('data', 'components', 'attackitems.py'),
+                  os.path.join('data', 'components', 'textbox.py'),
+                  os.path.join('data', 'states', 'death.py'),
+                  os.path.join('data', 'states', 'levels.py'),
+                  os.path.join('data', 'states', 'shop.py')]
+
+
+# Translated 클래스 : googletrans의 번역 결과 객체와 같은 모양(.text)을 가진 결과 객체
+class Translated(object):
+    """Result of a catalog lookup, shaped like a googletrans result."""
+    def __init__(self, origin, text, dest):
+        self.origin = origin
+        self.text = text
+        self.dest = dest
+
+
+# Catalog 클래스 : 언어별 카탈로그 파일을 한 번만 읽어 딕셔너리로 보관하는 클래스
+class Catalog(object):
+    """In-memory view of the on-disk translation catalogs."""
+    def __init__(self, directory=CATALOG_DIR):
+        self.directory = directory
+        self.tables = {}
+        self.outputs = {}
+
+    def path(self, dest):
+        return os.path.join(self.directory, dest + '.json')
+
+    def table(self, dest):
+        """Return the lookup table for a language, loading it on first use."""
+        if dest not in self.tables:
+            table = read_catalog(self.path(dest))
+            self.outputs[dest] = set(table.values())
+            self.tables[dest] = table
+        return self.tables[dest]
+
+    def is_translation(self, text, dest=DEFAULT_DEST):
+        """Return True if text is already a catalogued translation."""
+        self.table(dest)
+        return text in self.outputs[dest]
+
+    def lookup(self, text, dest=DEFAULT_DEST):
+        """Return the translation of text, or text itself if not catalogued."""
+        return self.table(dest).get(text, text)
+
+
+# TranslationCache 클래스 : 실행 중에 받아온 번역을 메모리(LRU)와 디스크(sqlite)에 저장하는 2단계 캐시
+class TranslationCache(object):
+    """
+    Two-tier cache of fetched translations keyed by (text, dest): a
+    bounded in-memory LRU in front of a persistent sqlite store.  get()
+    only looks at memory and never waits on the disk; the store is read
+    by load() and written by put() on the worker threads.  If the store
+    cannot be opened the cache keeps working from memory only.
+    """
+    def __init__(self, path=CACHE_PATH, capacity=CACHE_CAPACITY,
+                 absent_capacity=ABSENT_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.absent_capacity = absent_capacity
+        self.memory = collections.OrderedDict()
+        self.absent = collections.OrderedDict()
+        #메모리 계층과 디스크 계층은 따로 잠근다(게임 화면 스레드는 메모리 잠금만 잡는다).
+        self.memory_lock = threading.Lock()
+        self.disk_lock = threading.Lock()
+        self.connection = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def connect(self):
+        """Open the sqlite store on first use.  Call with disk_lock held."""
+        if self.connection is None and self.path:
+            try:
+                self.connection = sqlite3.connect(self.path,
+                                                  check_same_thread=False)
+                self.connection.execute('CREATE TABLE IF NOT EXISTS translations '
+                                        '(text TEXT, dest TEXT, translated TEXT, '
+                                        'PRIMARY KEY (text, dest))')
+                self.connection.commit()
+            except sqlite3.Error:
+                self.connection = None
+                self.path = None
+        return self.connection
+
+    def remember(self, key, translated):
+        """
+        Store key in the LRU, evicting the least recently used entry.
+        Call with memory_lock held.
+        """
+        self.absent.pop(key, None)
+        self.memory[key] = translated
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def get(self, text, dest=DEFAULT_DEST):
+        """
+        Return the translation of text from memory, or None.  A key that
+        keeps missing is counted as a miss only once.
+        """
+        key = (text, dest)
+        with self.memory_lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self.memory[key]
+
+            if key not in self.absent:
+                self.misses += 1
+                self.absent[key] = True
+                if len(self.absent) > self.absent_capacity:
+                    self.absent.popitem(last=False)
+            return None
+
+    def load(self, texts, dest=DEFAULT_DEST):
+        """
+        Fault texts in from the sqlite store.  Returns a dict of the
+        translations found, which are also put in memory.
+        """
+        found = {}
+        with self.disk_lock:
+            if self.connect():
+                for text in texts:
+                    row = self.connection.execute('SELECT translated FROM translations '
+                                                  'WHERE text = ? AND dest = ?',
+                                                  (text, dest)).fetchone()
+                    if row is not None:
+                        found[text] = row[0]
+
+        with self.memory_lock:
+            for text, translated in found.items():
+                self.disk_hits += 1
+                self.remember((text, dest), translated)
+        return found
+
+    def put(self, text, translated, dest=DEFAULT_DEST):
+        """Add a translation to both tiers."""
+        self.put_many({text: translated}, dest)
+
+    def put_many(self, translations, dest=DEFAULT_DEST):
+        """Add a {text: translation} dict to both tiers with one commit."""
+        with self.memory_lock:
+            for text, translated in translations.items():
+                self.remember((text, dest), translated)
+
+        with self.disk_lock:
+            if self.connect():
+                self.connection.executemany('INSERT OR REPLACE INTO translations '
+                                            'VALUES (?, ?, ?)',
+                                            [(text, dest, translated) for text, translated
+                                             in translations.items()])
+                self.connection.commit()
+
+    def stats(self):
+        """Return hit and miss counters for both tiers."""
+        with self.memory_lock:
+            return {'memory hits': self.memory_hits,
+                    'disk hits': self.disk_hits,
+                    'misses': self.misses,
+                    'memory size': len(self.memory)}
+
+
+# Translator 클래스 : googletrans.Translator 대신 사용하는 카탈로그 기반 번역기
+class Translator(object):
+    """
+    Drop-in replacement for googletrans.Translator backed by the catalog,
+    and by the cache of translations fetched at runtime.
+    """
+    def __init__(self, catalog=None, cache=None):
+        self.catalog = catalog or Catalog()
+        self.cache = cache
+
+    def lookup(self, text, dest=DEFAULT_DEST):
+        table = self.catalog.table(dest)
+        if text in table:
+            return table[text]
+        if self.cache:
+            cached = self.cache.get(text, dest)
+            if cached is not None:
+                return cached
+        return text
+
+    def translate(self, text, dest=DEFAULT_DEST, src='en'):
+        return Translated(text, self.lookup(text, dest), dest)
+
+    def format(self, template, *args, **kwargs):
+        """
+        Translate a message template, then fill in its placeholders.
+        The target language is given with the dest keyword.
+        """
+        dest = kwargs.pop('dest', DEFAULT_DEST)
+        return self.lookup(template, dest).format(*args, **kwargs)
+
+
+# AsyncTranslator 클래스 : 카탈로그에 없는 문자열을 백그라운드 스레드에서 번역하는 클래스
+class AsyncTranslator(object):
+    """
+    Translates catalog misses on background worker threads.  Lookups never
+    block: until a translation arrives the source text is returned.
+    Misses are collected per language for BATCH_DELAY seconds and sent to
+    fetch_batch(texts, dest) together, BATCH_SIZE at a time.
+    """
+    def __init__(self, catalog, cache, fetch_batch=None,
+                 workers=ASYNC_WORKERS, batch_size=BATCH_SIZE):
+        self.catalog = catalog
+        self.cache = cache
+        self.fetch_batch = fetch_batch or default_fetch_batch()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.failed = set()
+        self.batches = {}
+        #작업 스레드는 여기서 한 번만 띄운다(submit은 lock을 쥔 채 여러 스레드에서 호출된다).
+        self.threads = []
+        for _ in range(workers):
+            thread = threading.Thread(target=self.run)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def translate(self, text, dest=DEFAULT_DEST):
+        """Return the translation if known, otherwise queue it and return text."""
+        table = self.catalog.table(dest)
+        if text in table:
+            return table[text]
+        if not text or self.catalog.is_translation(text, dest):
+            return text
+        cached = self.cache.get(text, dest)
+        if cached is not None:
+            return cached
+
+        key = (text, dest)
+        with self.lock:
+            if key not in self.pending and key not in self.failed:
+                self.pending.add(key)
+                if dest not in self.batches:
+                    self.batches[dest] = []
+                    self.submit(self.flush, dest)
+                self.batches[dest].append(text)
+        return text
+
+    def prefetch(self, get_strings, dest=DEFAULT_DEST):
+        """
+        Queue every miss among get_strings() for translation.  The strings
+        are collected on a worker thread too, so the caller never waits.
+        """
+        self.submit(self.prefetch_strings, get_strings, dest)
+
+    def prefetch_strings(self, get_strings, dest):
+        for text in get_strings():
+            self.translate(text, dest)
+
+    def submit(self, function, *args):
+        self.queue.put((function, args))
+
+    def run(self):
+        """Worker loop: run queued jobs until the game exits."""
+        while True:
+            function, args = self.queue.get()
+            try:
+                function(*args)
+            except Exception:
+                log.exception('translation job %s failed', function.__name__)
+            self.queue.task_done()
+
+    def flush(self, dest):
+        """
+        Fault one batch of queued texts in from the disk cache, fetch the
+        rest and publish them to the cache.
+        """
+        time.sleep(BATCH_DELAY)
+        with self.lock:
+            texts = self.batches[dest][:self.batch_size]
+            del self.batches[dest][:self.batch_size]
+            if self.batches[dest]:
+                self.submit(self.flush, dest)
+            else:
+                del self.batches[dest]
+
+        #디스크 캐시에 있는 번역은 여기(작업 스레드)에서 읽어 들이고, 나머지만 원격으로 요청한다.
+        answered = set()
+        try:
+            answered.update(self.cache.load(texts, dest))
+            missing = [text for text in texts if text not in answered]
+            if missing:
+                self.fetch_missing(missing, dest, answered)
+        finally:
+            with self.lock:
+                for text in texts:
+                    self.pending.discard((text, dest))
+                    if text not in answered:
+                        self.failed.add((text, dest))
+
+    def fetch_missing(self, texts, dest, answered):
+        """
+        Fetch texts through fetch_batch, store the results and add the
+        texts that got a translation to answered.
+        """
+        try:
+            translations = self.fetch_batch(texts, dest)
+        except Exception:
+            log.exception('fetching %d texts for %s failed', len(texts), dest)
+            translations = None
+        if translations is None:
+            translations = []
+        elif len(translations) != len(texts):
+            log.warning('fetch_batch returned %d translations for %d texts (%s)',
+                        len(translations), len(texts), dest)
+
+        #답을 받지 못한 문자열(오류, 짧은 결과, None)은 flush에서 failed로 옮긴다.
+        fetched = dict((text, translated) for text, translated
+                       in zip(texts, translations) if translated is not None)
+        if fetched:
+            self.cache.put_many(fetched, dest)
+            answered.update(fetched)
+
+
+# BatchClient 클래스 : 여러 문자열을 한 번의 HTTP 요청으로 번역 서버에 보내는 클라이언트
+class BatchClient(object):
+    """
+    Client for a batch translation server.  One call posts
+    {"dest": ..., "texts": [...]} and expects {"translations": [...]} with
+    null for texts the server could not translate.
+    """
+    def __init__(self, url, timeout=BATCH_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.requests = 0
+        self.texts_sent = 0
+
+    def __call__(self, texts, dest=DEFAULT_DEST):
+        body = json.dumps({'dest': dest, 'texts': texts}).encode('utf-8')
+        request = urllib.request.Request(self.url, body,
+                                         {'Content-Type': 'application/json'})
+        response = urllib.request.urlopen(request, timeout=self.timeout)
+        try:
+            translations = json.loads(response.read().decode('utf-8'))['translations']
+        finally:
+            response.close()
+        self.requests += 1
+        self.texts_sent += len(texts)
+        return translations
+
+
+_remote = threading.local()
+
+
+# fetch_remote(texts, dest) 메소드 : googletrans로 문자열 목록을 번역하는 메소드(설치되어 있지 않으면 None 반환)
+def fetch_remote(texts, dest=DEFAULT_DEST):
+    """Translate a list of texts through googletrans, or return None."""
+    try:
+        import googletrans
+    except ImportError:
+        return None
+    if not hasattr(_remote, 'translator'):
+        _remote.translator = googletrans.Translator()
+    return [result.text for result in _remote.translator.translate(texts, dest=dest)]
+
+
+# default_fetch_batch() 메소드 : 번역 서버 주소가 있으면 BatchClient, 없으면 googletrans를 사용한다.
+def default_fetch_batch():
+    if TRANSLATION_SERVER_URL:
+        return BatchClient(TRANSLATION_SERVER_URL)
+    return fetch_remote
+
+
+# read_catalog(path) 메소드 : 카탈로그 파일을 읽어 번역 딕셔너리를 반환하는 메소드
+def read_catalog(path):
+    """
+    Read a catalog file.  A missing file or a catalog written by a
+    different CATALOG_VERSION yields an empty table, so untranslated
+    source text is shown instead.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with io.open(path, encoding='utf-8') as catalog_file:
+        catalog = json.load(catalog_file)
+    if catalog.get('version') != CATALOG_VERSION:
+        return {}
+    return catalog['entries']
+
+
+# placeholders(text) 메소드 : 템플릿 문자열의 치환 필드({}, {0}, {name}) 목록을 반환하는 메소드
+def placeholders(text):
+    """Return the sorted replacement fields of a format template."""
+    fields = []
+    auto_index = 0
+    for literal, field, spec, conversion in string.Formatter().parse(text):
+        if field is None:
+            continue
+        if field == '':
+            field = str(auto_index)
+            auto_index += 1
+        fields.append(field)
+    return sorted(fields)
+
+
+# write_catalog(path, dest, entries) 메소드 : 번역 딕셔너리를 카탈로그 파일로 저장하는 메소드
+def write_catalog(path, dest, entries):
+    catalog = {'version': CATALOG_VERSION,
+               'dest': dest,
+               'entries': entries}
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with io.open(path, 'w', encoding='utf-8') as catalog_file:
+        catalog_file.write(json.dumps(catalog, ensure_ascii=False,
+                                      indent=2, sort_keys=True))
+        catalog_file.write(u'\n')
+
+
+# extract_literals(path) 메소드 : 모듈에서 translator.translate('문장'), translator.format('템플릿') 형태의 문자열 상수를 모두 찾는 메소드
+def extract_literals(path):
+    """
+    Return every string literal passed to translator.translate or
+    translator.format in path.
+    """
+    with io.open(path, encoding='utf-8') as source_file:
+        tree = ast.parse(source_file.read(), path)
+
+    literals = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not node.args:
+            continue
+        func = node.func
+        if not (isinstance(func, ast.Attribute)
+                and func.attr in ('translate', 'format')
+                and isinstance(func.value, ast.Name)
+                and func.value.id == 'translator'):
+            continue
+        text = node.args[0]
+        if isinstance(text, ast.Constant) and isinstance(text.value, str):
+            literals.add(text.value)
+
+    return literals
+
+
+_module_literals = {}
+
+
+# module_literals(*modules) 메소드 : 모듈 객체들이 번역하는 문자열 목록을 반환하는 메소드(결과는 저장해두고 재사용)
+def module_literals(*modules):
+    """Return the catalogued literals used by the given module objects."""
+    literals = set()
+    for module in modules:
+        path = os.path.splitext(module.__file__)[0] + '.py'
+        if path not in _module_literals:
+            _module_literals[path] = extract_literals(path)
+        literals |= _module_literals[path]
+    return literals
+
+
+# extract_all_literals(modules) 메소드 : 모든 대상 모듈의 번역 문자열을 모으는 메소드
+def extract_all_literals(modules=SOURCE_MODULES):
+    literals = set()
+    for path in modules:
+        literals |= extract_literals(path)
+    return literals
+
+
+# build_catalog(dest, online) 메소드 : 카탈로그를 새로 만들거나 갱신하는 메소드
+def build_catalog(dest=DEFAULT_DEST, directory=CATALOG_DIR, online=True):
+    """
+    Extract literals and merge them into the catalog for dest.  Existing
+    entries are kept as they are, so hand-edited translations survive a
+    rebuild; entries whose literal no longer appears in the source are
+    dropped.  When online is True, missing entries are fetched in batches
+    from TRANSLATION_SERVER_URL or through googletrans; a fetched template
+    whose placeholders were mangled is left out.  Returns the literals
+    still missing.
+    """
+    path = Catalog(directory).path(dest)
+    existing = read_catalog(path)
+    literals = extract_all_literals()
+    entries = dict((text, existing[text]) for text in literals
+                   if text in existing)
+    missing = sorted(literals - set(entries))
+
+    if missing and online:
+        fetch_batch = default_fetch_batch()
+        for start in range(0, len(missing), BATCH_SIZE):
+            texts = missing[start:start + BATCH_SIZE]
+            translations = fetch_batch(texts, dest) or []
+            for text, translated in zip(texts, translations):
+                if translated is not None and placeholders(translated) == placeholders(text):
+                    entries[text] = translated
+        missing = sorted(literals - set(entries))
+
+    write_catalog(path, dest, entries)
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline translation catalog.')
+    parser.add_argument('--dest', default=DEFAULT_DEST,
+                        help='target language code (default: %(default)s)')
+    parser.add_argument('--offline', action='store_true',
+                        help='do not fetch missing entries through googletrans')
+    args = parser.parse_args()
+
+    missing = build_catalog(args.dest, online=not args.offline)
+    for text in missing:
+        print('untranslated: {}'.format(text))
+    print('{} written, {} untranslated'.format(Catalog().path(args.dest),
+                                               len(missing)))
+
+
+# translate_async(text, dest) 메소드 : 화면을 그릴 때 사용하는 비동기 번역 메소드
+def translate_async(text, dest=DEFAULT_DEST):
+    """
+    Return the translation of text if it is known, otherwise the text
+    itself while the translation is fetched in the background.
+    """
+    return async_translator.translate(text, dest)
+
+
+# prefetch(get_strings, dest) 메소드 : 다음 상태가 사용할 문자열들을 미리 백그라운드에서 번역해두는 메소드
+def prefetch(get_strings, dest=DEFAULT_DEST):
+    """Translate the strings returned by get_strings ahead of time."""
+    async_translator.prefetch(get_strings, dest)
+
+
+#전역 번역기 : 모든 모듈이 같은 카탈로그를 공유한다.
+catalog = Catalog()
+cache = TranslationCache()
+translator = Translator(catalog, cache)
+async_translator = AsyncTranslator(catalog, cache)
+
+
+if __name__ == '__main__':
+    main()
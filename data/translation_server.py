@@ -0,0 +1,170 @@
+"""
+Local stand-in for a batch translation server.
+
+The server answers the same JSON protocol as translation.BatchClient from a
+plain dictionary, so the translation layer can be exercised and measured
+without network access.
+
+Serve the shipped catalogs on port 8765:
+
+    python -m data.translation_server --port 8765
+
+and point the game at it with TRANSLATION_SERVER_URL=http://127.0.0.1:8765/
+
+Benchmark the batched client against it:
+
+    python -m data.translation_server --bench 2000 --batch-size 32
+"""
+
+# translation_server.py 파일 : 네트워크 없이 번역 계층을 시험하고 성능을 측정하기 위한 로컬 번역 서버
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from . import translation
+
+
+# StandInHandler 클래스 : {"dest", "texts"} 요청을 받아 서버의 딕셔너리로 번역해 돌려주는 핸들러
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers batch translation requests from the server's tables."""
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length).decode('utf-8'))
+        table = self.server.tables.get(request['dest'], {})
+        self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        body = json.dumps({'translations': [table.get(text)
+                                            for text in request['texts']]})
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# StandInServer 클래스 : 언어별 딕셔너리를 가진 로컬 번역 서버
+class StandInServer(ThreadingHTTPServer):
+    """
+    Dictionary-backed translation server.  tables maps a language code to
+    a {source: translation} dict; latency adds a fixed delay per request to
+    imitate a remote service.
+    """
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), tables=None, latency=0.0):
+        ThreadingHTTPServer.__init__(self, address, StandInHandler)
+        self.tables = tables if tables is not None else load_catalog_tables()
+        self.latency = latency
+        self.requests = 0
+
+    @property
+    def url(self):
+        return 'http://{}:{}/'.format(*self.server_address)
+
+    def start(self):
+        """Serve on a daemon thread and return the thread."""
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
+# load_catalog_tables() 메소드 : 배포된 카탈로그 파일들을 서버용 딕셔너리로 읽는 메소드
+def load_catalog_tables(directory=translation.CATALOG_DIR):
+    tables = {}
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            dest, ext = os.path.splitext(name)
+            if ext == '.json':
+                tables[dest] = translation.read_catalog(os.path.join(directory, name))
+    return tables
+
+
+# TimedBatchClient 클래스 : 요청마다 걸린 시간을 기록하는 측정용 클라이언트
+class TimedBatchClient(translation.BatchClient):
+    """BatchClient that records the latency of every request."""
+    def __init__(self, url, timeout=translation.BATCH_TIMEOUT):
+        translation.BatchClient.__init__(self, url, timeout)
+        self.latencies = []
+
+    def __call__(self, texts, dest=translation.DEFAULT_DEST):
+        start = time.time()
+        translations = translation.BatchClient.__call__(self, texts, dest)
+        self.latencies.append(time.time() - start)
+        return translations
+
+
+# benchmark(count, batch_size, latency) 메소드 : 비동기 번역기가 count개의 문자열을 번역하는 데 걸리는 시간을 측정하는 메소드
+def benchmark(count, batch_size=translation.BATCH_SIZE, latency=0.0,
+              workers=translation.ASYNC_WORKERS, dest=translation.DEFAULT_DEST):
+    """
+    Translate count distinct strings through AsyncTranslator and a
+    BatchClient talking to a stand-in server.  Returns a dict of results.
+    """
+    texts = ['benchmark phrase {}'.format(i) for i in range(count)]
+    table = dict((text, text.upper()) for text in texts)
+    server = StandInServer(tables={dest: table}, latency=latency)
+    server.start()
+
+    client = TimedBatchClient(server.url)
+    cache = translation.TranslationCache(path=None, capacity=count)
+    async_translator = translation.AsyncTranslator(translation.Catalog(), cache,
+                                                   client, workers, batch_size)
+    start = time.time()
+    for text in texts:
+        async_translator.translate(text, dest)
+    async_translator.queue.join()
+    elapsed = time.time() - start
+    server.shutdown()
+    server.server_close()
+
+    translated = sum(1 for text in texts
+                     if async_translator.translate(text, dest) == table[text])
+    return {'strings': count,
+            'translated': translated,
+            'requests': client.requests,
+            'seconds': elapsed,
+            'strings per second': count / elapsed if elapsed else float('inf'),
+            'seconds per request': sum(client.latencies) / len(client.latencies)
+                                   if client.latencies else 0.0,
+            'max seconds per request': max(client.latencies) if client.latencies else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in batch translation server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds added to every request')
+    parser.add_argument('--bench', type=int, default=0, metavar='COUNT',
+                        help='benchmark COUNT strings instead of serving')
+    parser.add_argument('--batch-size', type=int, default=translation.BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=translation.ASYNC_WORKERS)
+    args = parser.parse_args()
+
+    if args.bench:
+        results = benchmark(args.bench, args.batch_size, args.latency, args.workers)
+        for key in sorted(results):
+            print('{}: {}'.format(key, results[key]))
+        return
+
+    server = StandInServer((args.host, args.port), latency=args.latency)
+    print('serving {} on {}'.format(', '.join(sorted(server.tables)), server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
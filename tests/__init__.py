@@ -0,0 +1,19 @@
+"""
+Headless tests for the game's pure-logic subsystems.
+
+Run from the repository root with:
+
+    python -m unittest
+
+The game loads its resources relative to the repository root and opens a
+display on import, so the tests switch to the root and use SDL's dummy
+video and audio drivers.
+"""
+
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.chdir(ROOT)
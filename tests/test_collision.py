@@ -0,0 +1,152 @@
+import random
+import types
+import unittest
+
+import pygame as pg
+
+from data import collision
+
+
+def make_level(columns, rows):
+    tmx_data = types.SimpleNamespace(width=columns, height=rows)
+    return types.SimpleNamespace(renderer=types.SimpleNamespace(tmx_data=tmx_data),
+                                 allow_battles=False)
+
+
+class Walker(pg.sprite.Sprite):
+    """Bare sprite with the attributes CollisionHandler reads."""
+    def __init__(self, x, y):
+        super(Walker, self).__init__()
+        self.rect = pg.Rect(x, y, 32, 32)
+        self.blockers = []
+        self.blocker_version = 0
+
+
+def make_handler(sprites, blockers=(), columns=40, rows=40):
+    player = types.SimpleNamespace(rect=pg.Rect(-1000, -1000, 32, 32))
+    return collision.CollisionHandler(player, list(blockers), sprites,
+                                      pg.sprite.Group(), make_level(columns, rows))
+
+
+def random_blockers(rng, count, columns, rows):
+    """TMX style blockers: tile aligned, some hanging off the top edge."""
+    return [pg.Rect(rng.randrange(columns) * 32, rng.randrange(-1, rows) * 32, 32, 32)
+            for _ in range(count)]
+
+
+class TileGridTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(21)
+        self.columns, self.rows = 20, 15
+        self.blockers = random_blockers(self.rng, 60, self.columns, self.rows)
+
+    def make_grids(self):
+        """A grid on the installed backend and one on the pure-Python fallback."""
+        grid = collision.TileGrid(self.blockers, self.columns, self.rows)
+        np = collision.np
+        collision.np = None
+        try:
+            fallback = collision.TileGrid(self.blockers, self.columns, self.rows)
+        finally:
+            collision.np = np
+        return grid, fallback
+
+    def test_collides_matches_linear_scan(self):
+        grids = self.make_grids()
+        for _ in range(2000):
+            x = self.rng.randrange(-64, self.columns * 32 + 64)
+            y = self.rng.randrange(-64, self.rows * 32 + 64)
+            rect = pg.Rect(x, y, 32, 32)
+            expected = rect.collidelist(self.blockers) != -1
+            for grid in grids:
+                self.assertEqual(grid.collides(rect), expected, rect)
+
+    def test_blockers_off_the_map_are_kept(self):
+        grid = collision.TileGrid([pg.Rect(64, -32, 32, 32)], 4, 4)
+        self.assertTrue(grid.is_blocked(2, -1))
+        self.assertTrue(grid.collides(pg.Rect(70, -20, 32, 32)))
+        self.assertFalse(grid.collides(pg.Rect(64, 0, 32, 32)))
+
+    def test_free_tiles_and_reachable_agree_between_backends(self):
+        grid, fallback = self.make_grids()
+        self.assertEqual(sorted(grid.free_tiles()), sorted(fallback.free_tiles()))
+        for start in grid.free_tiles()[:10]:
+            self.assertEqual(grid.reachable(start), fallback.reachable(start))
+
+    def test_reachable_stops_at_walls(self):
+        wall = [pg.Rect(64, row * 32, 32, 32) for row in range(3)]
+        grid = collision.TileGrid(wall, 5, 3)
+        self.assertEqual(grid.reachable((0, 0)),
+                         set((column, row) for column in range(2) for row in range(3)))
+        self.assertEqual(grid.reachable((2, 0)), set())
+        self.assertEqual(len(grid.free_tiles()), 12)
+
+
+class SpatialGridTest(unittest.TestCase):
+    def test_collides_matches_linear_scan(self):
+        rng = random.Random(22)
+        grid = collision.SpatialGrid()
+        rects = [pg.Rect(rng.randrange(0, 640), rng.randrange(0, 640),
+                         rng.randrange(1, 48), rng.randrange(1, 48)) for _ in range(80)]
+        entries = [grid.insert(rect) for rect in rects]
+        for entry in entries[::2]:
+            grid.remove(entry)
+        rects = rects[1::2]
+        for _ in range(2000):
+            rect = pg.Rect(rng.randrange(-32, 672), rng.randrange(-32, 672), 32, 32)
+            self.assertEqual(grid.collides(rect), rect.collidelist(rects) != -1, rect)
+
+
+class SpriteOverlapTest(unittest.TestCase):
+    def test_sweep_and_prune_matches_group_collision(self):
+        rng = random.Random(23)
+        sprites = collision.SpriteGroup(*[Walker(rng.randrange(0, 1600), rng.randrange(0, 1600))
+                                          for _ in range(300)])
+        handler = make_handler(sprites)
+        for _ in range(5):
+            expected = set()
+            for sprite in sprites.sprites():
+                sprite.kill()
+                if pg.sprite.spritecollideany(sprite, sprites):
+                    expected.add(sprite)
+                sprites.add(sprite)
+            self.assertEqual(handler.find_sprite_overlaps(), expected)
+            for sprite in sprites:
+                sprite.rect.move_ip(rng.randrange(-40, 41), rng.randrange(-40, 41))
+
+    def test_membership_changes_are_picked_up(self):
+        first, second = Walker(0, 0), Walker(320, 320)
+        sprites = collision.SpriteGroup(first)
+        handler = make_handler(sprites)
+        first.kill()
+        sprites.add(second)
+        handler.update_sprite_blockers()
+        self.assertEqual(handler.sprite_list, [second])
+        self.assertNotIn(first, handler.sprite_entries)
+        self.assertNotIn(first, handler.sprite_versions)
+
+
+class WanderBoxTest(unittest.TestCase):
+    def old_wander_box(self, x, y):
+        """The 24 tile ring make_wander_box used to build."""
+        tiles = [(i, y - 3) for i in range(x - 3, x + 4)]
+        tiles += [(i, y + 3) for i in range(x - 3, x + 4)]
+        tiles += [(x - 3, i) for i in range(y - 2, y + 3)]
+        tiles += [(x + 3, i) for i in range(y - 2, y + 3)]
+        return [pg.Rect(column * 32, row * 32, 32, 32) for column, row in tiles]
+
+    def test_matches_old_ring(self):
+        from data.components import person
+        x, y = 10, 8
+        box = person.Person.make_wander_box(types.SimpleNamespace(location=[x, y]))
+        ring = self.old_wander_box(x, y)
+        self.assertEqual(len(ring), 24)
+        for left in range((x - 3) * 32, (x + 3) * 32 + 1, 4):
+            for top in range((y - 3) * 32, (y + 3) * 32 + 1, 4):
+                rect = pg.Rect(left, top, 32, 32)
+                self.assertEqual(not box.contains(rect),
+                                 rect.collidelist(ring) != -1, rect)
+
+
+if __name__ == '__main__':
+    unittest.main()
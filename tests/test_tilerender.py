@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pygame as pg
+
+from data import tilerender
+
+
+def make_surface(width, height):
+    surface = pg.Surface((width, height))
+    for x in range(width):
+        for y in range(height):
+            surface.set_at((x, y), ((x * 7) % 256, (y * 13) % 256, (x + y) % 256))
+    return surface
+
+
+class BakedMapTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        image = make_surface(24, 16)
+        self.assertTrue(tilerender.write_baked_map('key', image, self.directory))
+        baked = tilerender.read_baked_map('key', self.directory)
+        self.assertEqual(baked.get_size(), (24, 16))
+        self.assertEqual(pg.image.tostring(baked, 'RGB'), pg.image.tostring(image, 'RGB'))
+
+    def test_missing_or_damaged_files_read_as_none(self):
+        self.assertIsNone(tilerender.read_baked_map('missing', self.directory))
+        tilerender.write_baked_map('key', make_surface(8, 8), self.directory)
+        path = tilerender.baked_path('key', self.directory)
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:-1])
+        self.assertIsNone(tilerender.read_baked_map('key', self.directory))
+
+    def test_map_key_follows_file_contents(self):
+        tmx = tilerender.os.path.join('resources', 'tmx', 'town.tmx')
+        self.assertEqual(tilerender.map_key(tmx), tilerender.map_key(tmx))
+        self.assertNotEqual(tilerender.map_key(tmx),
+                            tilerender.map_key(tilerender.os.path.join('resources', 'tmx',
+                                                                       'castle.tmx')))
+
+
+class MapCacheTest(unittest.TestCase):
+    def load(self, filename):
+        self.loaded.append(filename)
+        return object(), pg.Surface((10, 10))
+
+    def setUp(self):
+        self.loaded = []
+        patcher = mock.patch.object(tilerender, 'load_baked_map', self.load)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_evicts_least_recently_used_map(self):
+        size = pg.Surface((10, 10)).get_bytesize() * 100
+        cache = tilerender.MapCache(max_bytes=size * 2)
+        cache.load('a')
+        cache.load('b')
+        cache.load('a')
+        cache.load('c')
+        self.assertEqual(list(cache.maps), ['a', 'c'])
+        self.assertEqual(cache.bytes, size * 2)
+        cache.load('b')
+        self.assertEqual(self.loaded, ['a', 'b', 'c', 'b'])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_keeps_the_map_just_loaded(self):
+        cache = tilerender.MapCache(max_bytes=1)
+        cache.load('a')
+        cache.load('b')
+        self.assertEqual(list(cache.maps), ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
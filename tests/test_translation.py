@@ -0,0 +1,109 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from data import translation
+
+
+class TempDirTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+class TranslationCacheTest(TempDirTest):
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = translation.TranslationCache(path=None, capacity=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 'C')
+
+    def test_disk_tier_persists_across_instances(self):
+        path = os.path.join(self.directory, 'cache.db')
+        translation.TranslationCache(path).put_many({'a': 'A', 'b': 'B'})
+
+        cache = translation.TranslationCache(path)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.load(['a', 'b', 'c']), {'a': 'A', 'b': 'B'})
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertEqual(cache.stats()['disk hits'], 2)
+
+    def test_repeat_misses_are_counted_once_and_bounded(self):
+        cache = translation.TranslationCache(path=None, absent_capacity=3)
+        for _ in range(5):
+            cache.get('missing')
+        self.assertEqual(cache.stats()['misses'], 1)
+        for text in 'abcdef':
+            cache.get(text)
+        self.assertEqual(len(cache.absent), 3)
+
+
+class AsyncTranslatorTest(TempDirTest):
+    def make_translator(self, fetch_batch):
+        return translation.AsyncTranslator(translation.Catalog(self.directory),
+                                           translation.TranslationCache(path=None),
+                                           fetch_batch)
+
+    def test_fetched_translations_are_served(self):
+        async_translator = self.make_translator(lambda texts, dest: [t.upper() for t in texts])
+        self.assertEqual(async_translator.translate('hello'), 'hello')
+        async_translator.queue.join()
+        self.assertEqual(async_translator.translate('hello'), 'HELLO')
+
+    def test_unanswered_texts_are_marked_failed(self):
+        async_translator = self.make_translator(lambda texts, dest: ['X'])
+        for text in ('a', 'b', 'c'):
+            async_translator.translate(text)
+        async_translator.queue.join()
+        self.assertEqual(async_translator.pending, set())
+        self.assertEqual(async_translator.failed, set([('b', 'ko'), ('c', 'ko')]))
+
+    def test_fetch_errors_are_marked_failed(self):
+        def fetch_batch(texts, dest):
+            raise IOError('offline')
+        async_translator = self.make_translator(fetch_batch)
+        async_translator.translate('a')
+        async_translator.queue.join()
+        self.assertEqual(async_translator.pending, set())
+        self.assertEqual(async_translator.failed, set([('a', 'ko')]))
+
+
+class CatalogTest(TempDirTest):
+    def test_placeholders(self):
+        self.assertEqual(translation.placeholders('{} of {}'), ['0', '1'])
+        self.assertEqual(translation.placeholders('{name} has {0}'), ['0', 'name'])
+        self.assertEqual(translation.placeholders('no fields'), [])
+
+    def test_build_catalog_keeps_edits_and_drops_stale_entries(self):
+        catalog = translation.Catalog(self.directory)
+        translation.write_catalog(catalog.path('ko'), 'ko',
+                                  {'Select an action.': 'edited',
+                                   'no longer in the source': 'stale'})
+
+        missing = translation.build_catalog('ko', self.directory, online=False)
+
+        with open(catalog.path('ko'), encoding='utf-8') as catalog_file:
+            written = json.load(catalog_file)
+        self.assertEqual(written['version'], translation.CATALOG_VERSION)
+        self.assertEqual(written['entries'], {'Select an action.': 'edited'})
+        self.assertIn('Select an item.', missing)
+        self.assertNotIn('Select an action.', missing)
+
+    def test_catalog_from_another_version_is_ignored(self):
+        path = os.path.join(self.directory, 'ko.json')
+        with open(path, 'w', encoding='utf-8') as catalog_file:
+            json.dump({'version': translation.CATALOG_VERSION + 1,
+                       'entries': {'a': 'b'}}, catalog_file)
+        self.assertEqual(translation.read_catalog(path), {})
+
+
+if __name__ == '__main__':
+    unittest.main()